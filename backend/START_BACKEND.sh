@@ -13,6 +13,9 @@ if [ ! -f "hackathon.db" ]; then
     echo ""
 fi
 
+# Skompiluj statystyki do formatu binarnego (szybszy start procesów roboczych)
+poetry run hackathon-compile-statistics --prune > /dev/null
+
 echo "🔧 Uruchamiam serwer na http://localhost:8000"
 echo "📚 Dokumentacja API: http://localhost:8000/docs"
 echo ""
@@ -0,0 +1,27 @@
+"""Add composite index for keyset pagination of calculations
+
+Revision ID: 3c9e1f7a2b4d
+Revises: f093b4da986c
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f7a2b4d'
+down_revision: Union[str, Sequence[str], None] = 'f093b4da986c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_calculations_datetime_id', 'calculations', ['calculation_datetime', 'calculation_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_calculations_datetime_id', table_name='calculations')
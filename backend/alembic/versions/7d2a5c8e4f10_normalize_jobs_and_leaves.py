@@ -0,0 +1,173 @@
+"""Move calculation jobs and leaves from JSON columns into indexed tables
+
+Revision ID: 7d2a5c8e4f10
+Revises: 3c9e1f7a2b4d
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a5c8e4f10'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f7a2b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Calculations copied per round trip while moving rows between the layouts.
+CHUNK = 1000
+
+calculations = sa.table(
+    'calculations',
+    sa.column('calculation_id', sa.String),
+    sa.column('jobs', sa.JSON),
+    sa.column('leaves', sa.JSON),
+)
+jobs_table = sa.table(
+    'calculation_jobs',
+    sa.column('calculation_id', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('start_date', sa.Date),
+    sa.column('end_date', sa.Date),
+    sa.column('start_year', sa.Integer),
+    sa.column('end_year', sa.Integer),
+    sa.column('base_salary', sa.Float),
+)
+leaves_table = sa.table(
+    'calculation_leaves',
+    sa.column('calculation_id', sa.String),
+    sa.column('position', sa.Integer),
+    sa.column('start_date', sa.Date),
+    sa.column('end_date', sa.Date),
+    sa.column('start_year', sa.Integer),
+    sa.column('end_year', sa.Integer),
+)
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%d-%m-%Y").date() if value else None
+
+
+def _format_date(value):
+    return value.strftime("%d-%m-%Y") if value else None
+
+
+def _chunks(connection, query):
+    """Rows of ``query`` (ordered by calculation_id) CHUNK calculations at a time."""
+    last = None
+    while True:
+        page = query if last is None else query.where(calculations.c.calculation_id > last)
+        rows = connection.execute(page.order_by(calculations.c.calculation_id).limit(CHUNK)).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1].calculation_id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('calculation_jobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('calculation_id', sa.String(length=36), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('start_year', sa.Integer(), nullable=False),
+    sa.Column('end_year', sa.Integer(), nullable=True),
+    sa.Column('base_salary', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['calculation_id'], ['calculations.calculation_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_calculation_jobs_calculation_id', 'calculation_jobs', ['calculation_id'], unique=False)
+    op.create_index('ix_calculation_jobs_years', 'calculation_jobs', ['end_year', 'start_year', 'calculation_id'], unique=False)
+    op.create_index('ix_calculation_jobs_start_year_salary', 'calculation_jobs', ['start_year', 'base_salary'], unique=False)
+    op.create_index('ix_calculation_jobs_base_salary', 'calculation_jobs', ['base_salary'], unique=False)
+    op.create_table('calculation_leaves',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('calculation_id', sa.String(length=36), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('start_year', sa.Integer(), nullable=False),
+    sa.Column('end_year', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['calculation_id'], ['calculations.calculation_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_calculation_leaves_calculation_id', 'calculation_leaves', ['calculation_id'], unique=False)
+    op.create_index('ix_calculation_leaves_years', 'calculation_leaves', ['end_year', 'start_year', 'calculation_id'], unique=False)
+
+    # Backfill from the JSON columns (API field names, dd-mm-yyyy dates).
+    connection = op.get_bind()
+    query = sa.select(calculations.c.calculation_id, calculations.c.jobs, calculations.c.leaves)
+    for rows in _chunks(connection, query):
+        jobs, leaves = [], []
+        for row in rows:
+            for position, job in enumerate(row.jobs or []):
+                start, end = _parse_date(job["startDate"]), _parse_date(job.get("endDate"))
+                jobs.append({
+                    "calculation_id": row.calculation_id, "position": position,
+                    "start_date": start, "end_date": end,
+                    "start_year": start.year, "end_year": end.year if end else None,
+                    "base_salary": float(job["baseSalary"]),
+                })
+            for position, leave in enumerate(row.leaves or []):
+                start, end = _parse_date(leave["startDate"]), _parse_date(leave.get("endDate"))
+                leaves.append({
+                    "calculation_id": row.calculation_id, "position": position,
+                    "start_date": start, "end_date": end,
+                    "start_year": start.year, "end_year": (end or start).year,
+                })
+        if jobs:
+            op.bulk_insert(jobs_table, jobs)
+        if leaves:
+            op.bulk_insert(leaves_table, leaves)
+
+    with op.batch_alter_table('calculations') as batch_op:
+        batch_op.drop_column('jobs')
+        batch_op.drop_column('leaves')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('calculations') as batch_op:
+        batch_op.add_column(sa.Column('jobs', sa.JSON(), nullable=False, server_default='[]'))
+        batch_op.add_column(sa.Column('leaves', sa.JSON(), nullable=False, server_default='[]'))
+
+    connection = op.get_bind()
+    query = sa.select(calculations.c.calculation_id)
+    for rows in _chunks(connection, query):
+        ids = [row.calculation_id for row in rows]
+        jobs = {calculation_id: [] for calculation_id in ids}
+        leaves = {calculation_id: [] for calculation_id in ids}
+        for job in connection.execute(
+            sa.select(jobs_table).where(jobs_table.c.calculation_id.in_(ids)).order_by(jobs_table.c.calculation_id, jobs_table.c.position)
+        ):
+            salary = job.base_salary
+            jobs[job.calculation_id].append({
+                "startDate": _format_date(job.start_date),
+                "endDate": _format_date(job.end_date),
+                "baseSalary": int(salary) if salary.is_integer() else salary,
+            })
+        for leave in connection.execute(
+            sa.select(leaves_table).where(leaves_table.c.calculation_id.in_(ids)).order_by(leaves_table.c.calculation_id, leaves_table.c.position)
+        ):
+            leaves[leave.calculation_id].append({"startDate": _format_date(leave.start_date), "endDate": _format_date(leave.end_date)})
+        for calculation_id in ids:
+            connection.execute(
+                calculations.update()
+                .where(calculations.c.calculation_id == calculation_id)
+                .values(jobs=jobs[calculation_id], leaves=leaves[calculation_id])
+            )
+
+    op.drop_index('ix_calculation_leaves_years', table_name='calculation_leaves')
+    op.drop_index('ix_calculation_leaves_calculation_id', table_name='calculation_leaves')
+    op.drop_table('calculation_leaves')
+    op.drop_index('ix_calculation_jobs_base_salary', table_name='calculation_jobs')
+    op.drop_index('ix_calculation_jobs_start_year_salary', table_name='calculation_jobs')
+    op.drop_index('ix_calculation_jobs_years', table_name='calculation_jobs')
+    op.drop_index('ix_calculation_jobs_calculation_id', table_name='calculation_jobs')
+    op.drop_table('calculation_jobs')
@@ -0,0 +1,147 @@
+"""Benchmarks for hackathon.algorithm on synthetic careers.
+
+Run from the backend directory (statistics.json is resolved from there):
+
+    poetry run python -m benchmarks.bench_algorithm --save benchmarks/baseline.json
+    poetry run python -m benchmarks.bench_algorithm --compare benchmarks/baseline.json --threshold 0.2
+
+``--compare`` exits with status 1 when any case is slower than the
+baseline by more than ``--threshold`` (a fraction, 0.2 = 20%).
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from hackathon import algorithm  # noqa: E402
+from hackathon.mapper import current  # noqa: E402
+from hackathon.models import Calculation, Job, Leave, LeaveType, Sex  # noqa: E402
+
+FIRST_YEAR = 1996
+LAST_YEAR = 2080
+JOB_COUNTS = (1, 5, 10)
+LEAVE_COUNTS = (0, 50, 200)
+CAREER_YEARS = (5, 20, 40, 60)
+BATCH_SIZES = (1, 100, 1000)
+
+def generate_calculation(rng: random.Random, jobs: int, leaves: int, career_years: int) -> Calculation:
+    """A career of ``career_years`` years split into ``jobs`` consecutive jobs with ``leaves`` leave records."""
+    start = rng.randint(FIRST_YEAR, LAST_YEAR - career_years)
+    retirement = start + career_years
+    cuts = sorted(rng.sample(range(start + 1, retirement), min(jobs - 1, career_years - 1)))
+    bounds = [start, *cuts, retirement]
+    job_list = [
+        Job(start_date=begin, end_date=end if end != retirement else None, base_salary=rng.uniform(3_000, 25_000))
+        for begin, end in zip(bounds, bounds[1:])
+    ]
+    leave_list = [
+        Leave(duration_days=rng.randint(1, 30), leave_year=rng.randrange(start, retirement), leave_type=rng.choice(list(LeaveType)))
+        for _ in range(leaves)
+    ]
+    age = rng.randint(18, 30) + (datetime.now().year - start)
+    return Calculation(
+        expected_pension=rng.uniform(2_000, 10_000),
+        age=age,
+        sex=rng.choice(list(Sex)),
+        year_work_start=start,
+        year_desired_retirement=retirement,
+        jobs=job_list,
+        leaves=leave_list,
+        calculation_datetime=datetime.now(),
+        calculation_id=UUID(int=rng.getrandbits(128)),
+    )
+
+def _time_us(func, min_run_seconds: float = 0.02, repeat: int = 5) -> float:
+    """Best per-call time in microseconds over ``repeat`` runs of at least ``min_run_seconds`` each."""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_run_seconds:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+def run(seed: int = 0) -> dict[str, float]:
+    rng = random.Random(seed)
+    results: dict[str, float] = {}
+    for years in CAREER_YEARS:
+        start = LAST_YEAR - years
+        results[f"get_salary[years={years}]"] = _time_us(lambda: algorithm.get_salary(5_000.0, start, LAST_YEAR))
+        results[f"get_inflation[years={years}]"] = _time_us(lambda: algorithm.get_inflation(start, LAST_YEAR))
+    for jobs in JOB_COUNTS:
+        for leaves in LEAVE_COUNTS:
+            for years in CAREER_YEARS:
+                if jobs > years:
+                    continue
+                calc = generate_calculation(rng, jobs, leaves, years)
+                results[f"compute_pension_funds[jobs={jobs},leaves={leaves},years={years}]"] = _time_us(
+                    lambda: algorithm.compute_pension_funds(calc))
+    calc = generate_calculation(rng, 3, 20, 40)
+    funds = algorithm.compute_pension_funds(calc)
+    age = max(current().life_expectancy)
+    last_year = max(funds) if funds else None
+    if last_year is not None:
+        results["compute_montly_pension"] = _time_us(lambda: algorithm.compute_montly_pension(funds[last_year], age))
+    for size in BATCH_SIZES:
+        batch = [generate_calculation(rng, rng.choice(JOB_COUNTS), rng.choice(LEAVE_COUNTS), rng.choice(CAREER_YEARS[1:])) for _ in range(size)]
+        results[f"compute_pension_funds_batch[size={size}]"] = _time_us(lambda: algorithm.compute_pension_funds_batch(batch))
+    return results
+
+def compare(measured: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print a comparison table and return the names of regressed cases."""
+    regressions = []
+    width = max(map(len, measured))
+    print(f"{'case':<{width}}  {'baseline us':>12}  {'current us':>12}  {'ratio':>6}")
+    for name, value in measured.items():
+        if name not in baseline:
+            print(f"{name:<{width}}  {'-':>12}  {value:>12.2f}  {'new':>6}")
+            continue
+        ratio = value / baseline[name]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}}  {baseline[name]:>12.2f}  {value:>12.2f}  {ratio:>6.2f}{flag}")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown as a fraction (default 0.2)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run(args.seed)
+    if args.save:
+        args.save.write_text(json.dumps({
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "statistics_version": current().version,
+                "seed": args.seed,
+            },
+            "results_us": results,
+        }, indent=2) + "\n")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results_us"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    elif not args.save:
+        for name, value in results.items():
+            print(f"{name}: {value:.2f} us")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Concurrent reads and writes on SQLite: default engine versus the configured one.
+
+Run from the backend directory:
+
+    poetry run python -m benchmarks.bench_database
+
+Each case seeds a fresh database file, then runs writer and reader tasks
+on one event loop, as requests share the server's, for a fixed time.
+Writers store one calculation with its job and leave through
+``database.store_calculations`` and commit, as POST /calculations does;
+readers fetch the first page of GET /calculations and a calculation by
+id. "default" is the engine main.py used to create (rollback journal, no
+pragmas); "configured" is ``database.build_async_engine`` with the
+DB_SQLITE_* settings. Writes that give up on a locked database are
+counted as errors.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from hackathon.converters import DbRows, to_db_rows  # noqa: E402
+from hackathon.database import async_url, build_async_engine, store_calculations  # noqa: E402
+from hackathon.models import Base, DbCalculation  # noqa: E402
+from hackathon.pagination import SORT_KEY  # noqa: E402
+from hackathon.schemas import CalculationRequest  # noqa: E402
+
+_REQUEST = CalculationRequest(
+    calculationDate="2025-01-01",
+    calculationTime="12:00:00",
+    expectedPension="5000",
+    age=40,
+    sex="F",
+    salary="7000",
+    isSickLeaveIncluded=True,
+    totalAccumulatedFunds="",
+    yearWorkStart=2005,
+    yearDesiredRetirement=2050,
+    postalCode="00-001",
+    jobs=[{"startDate": "01-01-2005", "endDate": None, "baseSalary": 7000.0}],
+    leaves=[{"startDate": "01-02-2020", "endDate": "14-02-2020"}],
+)
+
+def _rows(moment: datetime) -> DbRows:
+    return to_db_rows(_REQUEST, str(uuid.uuid4()), moment)
+
+async def _store(sessions, rows: list[DbRows]) -> None:
+    async with sessions() as db:
+        await store_calculations(db, rows)
+        await db.commit()
+
+async def _seed(engine, rows: int) -> list[str]:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    start = datetime(2025, 1, 1)
+    seeded = [_rows(start + timedelta(seconds=index)) for index in range(rows)]
+    await _store(async_sessionmaker(engine, expire_on_commit=False), seeded)
+    return [row.calculation["calculation_id"] for row in seeded[::max(1, rows // 1000)]]
+
+async def _measure(engine, ids: list[str], writers: int, readers: int, seconds: float) -> dict[str, float]:
+    counts = {"writes": 0, "reads": 0, "write_errors": 0}
+    latencies = {"write": [], "read": []}
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    stop = time.perf_counter() + seconds
+
+    async def write():
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                await _store(sessions, [_rows(datetime.now())])
+                key = "writes"
+            except OperationalError:
+                key = "write_errors"
+            counts[key] += 1
+            latencies["write"].append(time.perf_counter() - started)
+
+    async def read():
+        page = select(DbCalculation).order_by(*(column.desc() for column in SORT_KEY)).limit(20)
+        index = 0
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            async with engine.connect() as connection:
+                (await connection.execute(page)).all()
+                (await connection.execute(select(DbCalculation).where(DbCalculation.calculation_id == ids[index % len(ids)]))).first()
+            index += 1
+            counts["reads"] += 1
+            latencies["read"].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(write() for _ in range(writers)), *(read() for _ in range(readers)))
+
+    results = {
+        "writes_per_s": counts["writes"] / seconds,
+        "reads_per_s": counts["reads"] / seconds,
+        "write_errors": counts["write_errors"],
+    }
+    for kind, values in latencies.items():
+        values.sort()
+        if values:
+            results[f"{kind}_p99_ms"] = values[min(len(values) - 1, int(len(values) * 0.99))] * 1e3
+    return results
+
+async def _run_case(engine, rows: int, writers: int, readers: int, seconds: float) -> dict[str, float]:
+    try:
+        ids = await _seed(engine, rows)
+        return await _measure(engine, ids, writers, readers, seconds)
+    finally:
+        await engine.dispose()
+
+def run(rows: int, writers: int, readers: int, seconds: float) -> dict[str, float]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        cases = {"default": create_async_engine, "configured": build_async_engine}
+        for name, make_engine in cases.items():
+            engine = make_engine(async_url(f"sqlite:///{Path(directory) / name}.db"))
+            for metric, value in asyncio.run(_run_case(engine, rows, writers, readers, seconds)).items():
+                results[f"{metric}[{name}]"] = value
+    return results
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="calculations seeded before measuring (default 20000)")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent writer tasks (default 4)")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent reader tasks (default 8)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured time per case (default 5)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+    results = run(args.rows, args.writers, args.readers, args.seconds)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name}: {value:.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Startup cost of the statistics tables: parsing JSON versus mapping compiled packs.
+
+Run from the backend directory:
+
+    poetry run python -m benchmarks.bench_statistics
+
+Cold start is measured in fresh interpreters (what a uvicorn or pool
+worker pays when it spawns): once with packs disabled, so every scenario
+is parsed from JSON, and once against packs compiled into a temporary
+directory. Load times are per scenario, in-process.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from hackathon import mapper  # noqa: E402
+
+_CHILD = """
+import time
+start = time.perf_counter()
+import hackathon.mapper
+print(time.perf_counter() - start)
+"""
+
+def cold_start(env: dict[str, str], runs: int) -> tuple[float, float]:
+    """Median (spawn-to-exit, mapper import) seconds over ``runs`` fresh interpreters."""
+    walls, imports = [], []
+    for _ in range(runs):
+        start = timeit.default_timer()
+        out = subprocess.run([sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True).stdout
+        walls.append(timeit.default_timer() - start)
+        imports.append(float(out))
+    return statistics.median(walls), statistics.median(imports)
+
+def run(runs: int) -> dict[str, float]:
+    results = {}
+    with tempfile.TemporaryDirectory() as compiled, tempfile.TemporaryDirectory() as empty:
+        base = {**os.environ, "PYTHONPATH": str(SRC), "STATISTICS_SHARED_DIR": ""}
+        subprocess.run(
+            [sys.executable, "-m", "hackathon.compile_statistics", "--output", compiled],
+            env=base, capture_output=True, check=True,
+        )
+        for name, directory in (("json", empty), ("pack", compiled)):
+            wall, imported = cold_start({**base, "STATISTICS_COMPILED_DIR": directory}, runs)
+            results[f"cold_start_wall_ms[{name}]"] = wall * 1e3
+            results[f"cold_start_import_ms[{name}]"] = imported * 1e3
+
+        from hackathon import statistics_pack
+        for scenario, source in mapper.registry.sources().items():
+            version = source.parse(scenario).version
+            path = statistics_pack.find_pack(version, compiled)
+            timer = timeit.Timer(lambda: source.parse(scenario))
+            number = max(1, timer.autorange()[0])
+            results[f"load_ms[{scenario},json]"] = min(timer.repeat(5, number)) / number * 1e3
+            timer = timeit.Timer(lambda: mapper.StatisticsSnapshot.from_pack(path, scenario))
+            number = max(1, timer.autorange()[0])
+            results[f"load_ms[{scenario},pack]"] = min(timer.repeat(5, number)) / number * 1e3
+    return results
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="fresh interpreters per cold-start case (default 15)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, value in results.items():
+            print(f"{name}: {value:.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
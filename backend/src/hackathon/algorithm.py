@@ -1,6 +1,9 @@
-from .models import Calculation, Leave, Sex
-from .mapper import GROWTH, VALORIZATION, AVERAGE_WAGE, INFLATION, LIFE_EXPECTANCY, EXPECTED_ABSENCE_FEMALE, EXPECTED_ABSENCE_MALE
+from .models import Calculation, LeaveType, LEAVE_MULTIPLIERS, LEAVE_MULTIPLIER_COLUMN, Sex
+from .mapper import StatisticsSnapshot, YearSeries, current
 from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
 
 TAU = 0.196
 FEMALE_EXPERIENCE = 20
@@ -9,62 +12,299 @@ LEAP_YEAR_DAYS = 366
 NORMAL_YEAR_DAYS = 365
 AVG_SALARIES_PER_YEAR_THRESHOLD = 30
 
-def get_salary(base_salary: float, start_year: int, target_year: int):
-    if target_year < start_year:
-        for i in range(start_year - 1, target_year - 1, -1):
-            base_salary = base_salary / (1 + GROWTH[i])
-    else:
-        for i in range(start_year, target_year):
-            base_salary = base_salary * (1 + GROWTH[i])
-    
-    return base_salary
-
-def get_inflation(start_year: int, end_year: int):
-    inflation = 1
-    for i in range(start_year, end_year):
-        inflation = inflation * (1 + INFLATION[i])
-    
-    return inflation
-
-def compute_pension_funds(calc: Calculation):
-    jobs = sorted(calc.jobs, key= lambda x: x.start_date)
-    start_year = jobs[0].start_date
-    years: dict[int, (float, float)] = {}
-    if len(calc.leaves) == 0:
-        if calc.sex == Sex.FEMALE:
-            avg_leaves = EXPECTED_ABSENCE_FEMALE[max(18, min(65, calc.age))]
+def _days_in_years(years: np.ndarray) -> np.ndarray:
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    return np.where(leap, LEAP_YEAR_DAYS, NORMAL_YEAR_DAYS)
+
+class _EngineTables:
+    """Year tables the engine derives from one statistics snapshot."""
+    __slots__ = ("contribution_cap", "valorization_factor", "horizon_year")
+
+    def __init__(self, statistics: StatisticsSnapshot):
+        wage, valorization = statistics.average_wage, statistics.valorization
+        self.contribution_cap = YearSeries(wage.first_year, AVG_SALARIES_PER_YEAR_THRESHOLD * wage.values)
+        self.valorization_factor = YearSeries(valorization.first_year, 1 + valorization.values)
+        # First year past the statistics tables; careers are simulated up to here at most.
+        self.horizon_year = min(self.contribution_cap.end_year, self.valorization_factor.end_year)
+
+@lru_cache(maxsize=8)
+def _engine_tables(statistics: StatisticsSnapshot) -> _EngineTables:
+    return _EngineTables(statistics)
+
+def horizon_year(statistics: StatisticsSnapshot | None = None) -> int:
+    """First year past the statistics tables of ``statistics`` (the current snapshot by default)."""
+    return _engine_tables(statistics or current()).horizon_year
+
+_DAYS_IN_YEAR = YearSeries(1900, _days_in_years(np.arange(1900, 2200)))
+_SYNTHETIC_LEAVE_MULTIPLIER = LEAVE_MULTIPLIERS[LeaveType.SICKNESS]
+
+def get_salary(base_salary: float, start_year: int, target_year: int, statistics: StatisticsSnapshot | None = None):
+    return base_salary * (statistics or current()).growth_index.between(start_year, target_year)
+
+def get_inflation(start_year: int, end_year: int, statistics: StatisticsSnapshot | None = None):
+    return (statistics or current()).inflation_index.between(start_year, end_year)
+
+def get_real_value(amount: float, year: int, base_year: int | None = None, statistics: StatisticsSnapshot | None = None):
+    """Express a nominal amount from ``year`` in ``base_year`` money (the current year by default)."""
+    if base_year is None:
+        base_year = datetime.now().year
+    return amount / get_inflation(base_year, year, statistics)
+
+def _job_end(job, calc: Calculation) -> int:
+    if job.end_date is None:
+        return calc.year_desired_retirement
+    return min(job.end_date, calc.year_desired_retirement)
+
+def _retirement_age(calc: Calculation) -> int:
+    return calc.age + calc.year_desired_retirement - calc.calculation_datetime.year
+
+class CareerBatch:
+    """Calculations laid out on a shared (person x year) grid.
+
+    Rows are the calculations with an eligible career, columns the union of
+    their contribution years. Everything that does not depend on the macro
+    scenario (job spans, leave-adjusted contribution rates, initial funds) is
+    prepared once here; ``funds`` then evaluates the whole grid with a handful
+    of array operations.
+
+    The batch is bound to one statistics snapshot (the current one unless
+    given), so a reload mid-request never mixes two versions.
+    """
+
+    def __init__(self, calcs: list[Calculation], now: int | None = None, statistics: StatisticsSnapshot | None = None):
+        self.now = datetime.now().year if now is None else now
+        self.statistics = statistics = statistics or current()
+        self.size = len(calcs)
+        members, first_years, initial_funds, ages = [], [], [], []
+        job_rows, row_starts = [], []
+        leave_people, leave_indexes, synthetic_leaves = [], [], []
+        for index, calc in enumerate(calcs):
+            ends = [_job_end(job, calc) for job in calc.jobs]
+            threshold = MALE_EXPERIENCE if calc.sex==Sex.MALE else FEMALE_EXPERIENCE
+            if sum(end - job.start_date + 1 for job, end in zip(calc.jobs, ends)) < threshold:
+                continue
+            # Funds already on the account cover every year before the current one.
+            cutoff = self.now if calc.total_accumulated_funds is not None else -1
+            rows = [(job.start_date, max(job.start_date, cutoff), end, job.base_salary)
+                    for job, end in zip(calc.jobs, ends) if end > max(job.start_date, cutoff)]
+            if not rows:
+                continue
+            person = len(members)
+            members.append(index)
+            first_years.append(min(job.start_date for job in calc.jobs))
+            initial_funds.append(calc.total_accumulated_funds or 0.0)
+            ages.append(_retirement_age(calc))
+            row_starts.append(len(job_rows))
+            job_rows.extend(rows)
+            leave_index = calc.leave_index
+            if len(leave_index) > 0:
+                leave_people.append(np.full(len(leave_index), person))
+                leave_indexes.append(leave_index)
+            elif calc.include_expected_absence:
+                expected_absence = statistics.expected_absence_female if calc.sex == Sex.FEMALE else statistics.expected_absence_male
+                synthetic_leaves.append((person, expected_absence[max(18, min(65, calc.age))]))
+
+        self.members = members
+        self.retirement_ages = ages
+        if not members:
+            self.start_year = self.end_year = self.now
+            return
+        jobs = np.array(job_rows)
+        self.start_year = int(jobs[:, 0].min())
+        self.end_year = int(jobs[:, 2].max())
+        width = self.end_year - self.start_year
+        columns = np.arange(width)
+        self.years = columns + self.start_year
+
+        self._row_starts = np.array(row_starts)
+        self._job_salary_offsets = jobs[:, 0].astype(np.int64) - self.start_year
+        self._job_base = jobs[:, 3]
+        job_mask = (columns >= jobs[:, 1, None] - self.start_year) & (columns < jobs[:, 2, None] - self.start_year)
+        self._job_mask = job_mask
+        self.active = np.logical_or.reduceat(job_mask, self._row_starts, axis=0)
+        self._initial_funds = np.array(initial_funds)[:, None]
+
+        # Leave days and multiplier-weighted leave days per (person, year).
+        people = len(members)
+        leave_days = np.zeros((people, width))
+        weighted_leave_days = np.zeros((people, width))
+        if leave_indexes:
+            offsets = np.concatenate([index.years for index in leave_indexes]) - self.start_year
+            in_grid = (offsets >= 0) & (offsets < width)
+            cells = np.concatenate(leave_people)[in_grid] * width + offsets[in_grid]
+            days_by_type = np.concatenate([index.days for index in leave_indexes])[in_grid]
+            days = days_by_type.sum(axis=1)
+            weighted = days_by_type @ LEAVE_MULTIPLIER_COLUMN
+            leave_days += np.bincount(cells, weights=days, minlength=people * width).reshape(people, width)
+            weighted_leave_days += np.bincount(cells, weights=weighted, minlength=people * width).reshape(people, width)
+        for person, avg_leaves in synthetic_leaves:
+            leave_days[person] = avg_leaves
+            weighted_leave_days[person] = avg_leaves * _SYNTHETIC_LEAVE_MULTIPLIER
+        total_days = _DAYS_IN_YEAR.window(self.start_year, self.end_year)
+        self._contribution_rate = ((total_days - leave_days) * TAU + weighted_leave_days) / total_days
+
+        self._deflators = np.array([get_inflation(year, self.now, statistics) for year in first_years])[:, None]
+
+    def funds(self, growth: np.ndarray, contribution_cap: np.ndarray, valorization_factor: np.ndarray, salary_scale=None) -> np.ndarray:
+        """Nominal funds on the grid for per-year scenario arrays.
+
+        ``growth`` holds cumulative salary-growth levels, the others per-year
+        values, all over ``self.years`` on the last axis; leading axes (e.g.
+        simulated paths) broadcast through to the result. ``salary_scale``
+        optionally multiplies every salary, with its own leading axes.
+        """
+        job_growth = growth[..., self._job_salary_offsets, None]
+        job_salaries = (self._job_base[:, None] / job_growth) * growth[..., None, :] * self._job_mask
+        if salary_scale is not None:
+            job_salaries = job_salaries * np.asarray(salary_scale)[..., None, None]
+        salaries = np.add.reduceat(job_salaries, self._row_starts, axis=-2)
+        contributions = np.minimum(12 * salaries * self._contribution_rate, contribution_cap[..., None, :])
+
+        # funds[y] = (funds[y-1] + contributions[y]) * valorization[y] in every
+        # active year, unrolled into prefix products along the year axis.
+        factor = np.where(self.active, valorization_factor[..., None, :], 1.0)
+        level = np.cumprod(factor, axis=-1)
+        return level * (self._initial_funds + np.cumsum(contributions * factor / level, axis=-1))
+
+    def evaluate(self, salary_scale=None) -> np.ndarray:
+        """Nominal funds on the grid under the batch's statistics snapshot."""
+        tables = _engine_tables(self.statistics)
+        return self.funds(
+            self.statistics.growth_index.window(self.start_year, self.end_year - 1),
+            tables.contribution_cap.window(self.start_year, self.end_year),
+            tables.valorization_factor.window(self.start_year, self.end_year),
+            salary_scale,
+        )
+
+    def final_funds(self, funds: np.ndarray) -> np.ndarray:
+        """Funds at each person's last contribution year, shape ``funds.shape[:-1]``."""
+        last = funds.shape[-1] - 1 - np.argmax(self.active[:, ::-1], axis=1)
+        return np.take_along_axis(funds, np.broadcast_to(last[:, None], (*funds.shape[:-1], 1)), axis=-1)[..., 0]
+
+    def trajectories(self, funds: np.ndarray) -> list[dict[int, tuple[float, float]]]:
+        """``compute_pension_funds``-shaped dicts for every input calculation, in input order."""
+        result: list[dict[int, tuple[float, float]]] = [{} for _ in range(self.size)]
+        real = funds / self._deflators
+        for person, index in enumerate(self.members):
+            active = self.active[person]
+            result[index] = dict(zip(self.years[active].tolist(), zip(funds[person, active].tolist(), real[person, active].tolist())))
+        return result
+
+    def monthly_pensions(self, funds: np.ndarray) -> list[dict[str, float] | None]:
+        """Monthly pension from the funds of the last contribution year, or None when there is none."""
+        result: list[dict[str, float] | None] = [None] * self.size
+        if not self.members:
+            return result
+        final = self.final_funds(funds)
+        final_real = final / self._deflators[:, 0]
+        for person, index in enumerate(self.members):
+            age = self.retirement_ages[person]
+            if age in self.statistics.life_expectancy:
+                result[index] = compute_montly_pension((float(final[person]), float(final_real[person])), age, self.statistics)
+        return result
+
+def compute_pension_funds(calc: Calculation, statistics: StatisticsSnapshot | None = None) -> dict[int, tuple[float, float]]:
+    batch = CareerBatch([calc], statistics=statistics)
+    if not batch.members:
+        return {}
+    return batch.trajectories(batch.evaluate())[0]
+
+def compute_pension_funds_batch(calcs: list[Calculation], statistics: StatisticsSnapshot | None = None) -> list[dict]:
+    """Funds trajectories and monthly pensions for many calculations in one pass.
+
+    Each entry has ``funds_by_year`` (as returned by ``compute_pension_funds``)
+    and ``monthly_pension`` (as returned by ``compute_montly_pension``, or None
+    when the career is not eligible).
+    """
+    batch = CareerBatch(calcs, statistics=statistics)
+    if not batch.members:
+        return [{"funds_by_year": {}, "monthly_pension": None} for _ in calcs]
+    funds = batch.evaluate()
+    return [
+        {"funds_by_year": years, "monthly_pension": pension}
+        for years, pension in zip(batch.trajectories(funds), batch.monthly_pensions(funds))
+    ]
+
+class RetirementCheckpoints:
+    """Per-year accumulation state of one career, for retirement-year what-ifs.
+
+    The career is simulated once up to ``horizon`` (open-ended jobs running
+    until then) and every year's state is kept: funds before and after
+    valorization and the experience a retirement in that year would count.
+    Funds at the end of year ``y`` do not depend on anything after ``y``, so
+    the pension for any retirement year up to the horizon is a lookup. Past
+    the last contribution year funds stay flat, so later retirement years
+    reuse the last state; that includes years past the horizon when every
+    job ends by then.
+    """
+
+    def __init__(self, calc: Calculation, horizon: int | None = None, now: int | None = None, statistics: StatisticsSnapshot | None = None):
+        self.statistics = statistics = statistics or current()
+        if horizon is None:
+            horizon = horizon_year(statistics)
+        self.calc = calc
+        self.horizon = horizon
+        # Nothing is contributed after the horizon, so the last state holds for any later year.
+        self._complete = all(job.end_date is not None and job.end_date <= horizon for job in calc.jobs)
+        self._batch = CareerBatch([calc.model_copy(update={"year_desired_retirement": horizon})], now=now, statistics=statistics)
+        self.start_year = self._batch.start_year
+        if not self._batch.members:
+            self.funds = self.funds_before_valorization = np.empty(0)
+            self._deflator = 1.0
+            self._first_contribution = 0
         else:
-            avg_leaves = EXPECTED_ABSENCE_MALE[max(18, min(65, calc.age))]
-        calc.leaves = [Leave(leave_year=year, duration_days=avg_leaves) for year in range(calc.year_work_start, calc.year_desired_retirement + 1)]
-    if calc.total_accumulated_funds is None:
-        total_funds = 0
-        experience = 0
-    else:
-        total_funds = calc.total_accumulated_funds
-        start_idx = 0
-        while jobs[i].end_date < datetime.now().year:
-            i += 1
-        jobs[i].start_date = min(jobs[i].start_date, datetime.now().year)
-        jobs = jobs[start_idx:]
-
-        
-    threshold = MALE_EXPERIENCE if calc.sex==Sex.MALE else FEMALE_EXPERIENCE
-    for job in jobs:
-        experience = experience + (job.end_date if job.end_date is not None else datetime.now().year) - job.start_date + 1
-        for i in range(job.start_date, job.end_date):
-            total_days = NORMAL_YEAR_DAYS if i % 4 == 0 else LEAP_YEAR_DAYS
-            effective_days = total_days
-            for leave in calc.leaves:
-                if leave.leave_year == i:
-                    effective_days -= leave.duration_days
-            total_sum_under_taxes = min(12 * get_salary(job.base_salary, job.start_date, i) * (effective_days / total_days * TAU + (total_days - effective_days) / total_days * leave.get_multiplier()), AVG_SALARIES_PER_YEAR_THRESHOLD * AVERAGE_WAGE[i])
-            total_funds = total_funds + total_sum_under_taxes
-            total_funds = total_funds * (1 + VALORIZATION[i])
-            inflation=get_inflation(start_year, datetime.now().year)
-            years[i] = (total_funds, total_funds / inflation)
-    
-    return years if experience >= threshold else {}
-
-def compute_montly_pension(available_funds: (float, float), age: int):
+            funds = self._batch.evaluate()[0]
+            factor = np.where(self._batch.active[0], _engine_tables(statistics).valorization_factor.window(self.start_year, self._batch.end_year), 1.0)
+            self.funds = funds
+            self.funds_before_valorization = funds / factor
+            self._deflator = float(self._batch._deflators[0, 0])
+            self._first_contribution = int(np.argmax(self._batch.active[0]))
+        # experience[r] for r = start_year + i: sum of (end - start + 1) over jobs, open-ended ones ending at r.
+        retirement_years = np.arange(self.start_year, horizon + 1)
+        starts = np.array([job.start_date for job in calc.jobs])[:, None]
+        ends = np.array([horizon if job.end_date is None else job.end_date for job in calc.jobs])[:, None]
+        self.experience = (np.minimum(ends, retirement_years) - starts + 1).sum(axis=0)
+
+    def pensions(self, retirement_years) -> dict[int, dict[str, float] | None]:
+        """Monthly pension (as ``compute_montly_pension``) for every retirement year, None where not eligible.
+
+        Raises ``ValueError`` for a year past the horizon while a job still
+        contributes then; those need checkpoints with a later horizon.
+        """
+        threshold = MALE_EXPERIENCE if self.calc.sex==Sex.MALE else FEMALE_EXPERIENCE
+        calc_year = self.calc.calculation_datetime.year
+        result: dict[int, dict[str, float] | None] = {}
+        for year in retirement_years:
+            offset = year - self.start_year
+            age = self.calc.age + year - calc_year
+            if year > self.horizon and not self._complete:
+                raise ValueError(f"retirement in {year} is past the checkpoint horizon {self.horizon}, while the career still contributes")
+            if (not len(self.funds) or offset <= self._first_contribution
+                    or self.experience[min(offset, len(self.experience) - 1)] < threshold
+                    or age not in self.statistics.life_expectancy):
+                result[year] = None
+                continue
+            nominal = float(self.funds[min(offset, len(self.funds)) - 1])
+            result[year] = compute_montly_pension((nominal, nominal / self._deflator), age, self.statistics)
+        return result
+
+    def pension_at(self, retirement_year: int) -> dict[str, float] | None:
+        return self.pensions([retirement_year])[retirement_year]
+
+def compute_pensions_by_retirement_year(calc: Calculation, retirement_years, statistics: StatisticsSnapshot | None = None) -> dict[int, dict[str, float] | None]:
+    """Monthly pensions for a whole range of retirement years in one pass.
+
+    Raises ``ValueError`` for years past the statistics tables while the
+    career still contributes then, as ``RetirementCheckpoints.pensions``.
+    """
+    retirement_years = list(retirement_years)
+    if not retirement_years:
+        return {}
+    statistics = statistics or current()
+    horizon = min(max(retirement_years), horizon_year(statistics))
+    return RetirementCheckpoints(calc, horizon=horizon, statistics=statistics).pensions(retirement_years)
+
+def compute_montly_pension(available_funds: (float, float), age: int, statistics: StatisticsSnapshot | None = None):
     (nominal, real) = available_funds
-    return {"nominal": nominal / LIFE_EXPECTANCY[age], "real": real / LIFE_EXPECTANCY[age]}
+    life_expectancy = (statistics or current()).life_expectancy
+    return {"nominal": nominal / life_expectancy[age], "real": real / life_expectancy[age]}
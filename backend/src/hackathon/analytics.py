@@ -0,0 +1,21 @@
+from sqlalchemy import distinct, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DbJob
+
+async def count_calculations_with_job_active_in(db: AsyncSession, year: int) -> int:
+    """Calculations with at least one job covering ``year`` (open-ended jobs cover every later year)."""
+    query = select(func.count(distinct(DbJob.calculation_id))).where(
+        DbJob.start_year <= year,
+        or_(DbJob.end_year.is_(None), DbJob.end_year >= year),
+    )
+    return await db.scalar(query)
+
+async def average_base_salary_by_start_year(db: AsyncSession) -> list[tuple[int, int, float]]:
+    """(start year, jobs, average base salary) per start year, read from the covering index."""
+    query = (
+        select(DbJob.start_year, func.count(), func.avg(DbJob.base_salary))
+        .group_by(DbJob.start_year)
+        .order_by(DbJob.start_year)
+    )
+    return [tuple(row) for row in await db.execute(query)]
@@ -0,0 +1,121 @@
+import json
+import os
+import re
+import uuid
+from datetime import datetime
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+from .converters import DbRows, to_calculation, to_db_rows
+from .mapper import StatisticsSnapshot
+from .models import Calculation
+from .schemas import CalculationRequest
+
+# Rows inserted (and priced) per statement; the whole batch is committed once.
+BATCH_CHUNK_SIZE = int(os.getenv("CALCULATION_BATCH_CHUNK_SIZE", "1000"))
+BATCH_MAX_ROWS = int(os.getenv("CALCULATION_BATCH_MAX_ROWS", "100000"))
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+_REQUEST = TypeAdapter(CalculationRequest)
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class BatchTooLarge(ValueError):
+    pass
+
+def _body_errors(e: ValidationError, prefix: tuple = ()) -> list[dict]:
+    # Same shape as FastAPI's own body errors, so clients handle both alike.
+    return [{**error, "loc": ("body", *prefix, *error["loc"])} for error in e.errors(include_url=False)]
+
+def is_ndjson(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+def _json_array_items(text: str):
+    # Decode the top-level array one item at a time, so the record count is known while parsing.
+    decoder = json.JSONDecoder()
+    position = _skip_whitespace(text, 0)
+    if text[position:position + 1] != "[":
+        raise RequestValidationError([{"type": "list_type", "loc": ("body",), "msg": "Input should be a valid array", "input": None}])
+    position = _skip_whitespace(text, position + 1)
+    if text[position:position + 1] == "]":
+        position += 1
+    else:
+        while True:
+            try:
+                item, position = decoder.raw_decode(text, position)
+            except json.JSONDecodeError as e:
+                raise _json_invalid(e.msg, e.pos)
+            yield item
+            position = _skip_whitespace(text, position)
+            separator = text[position:position + 1]
+            if separator not in ("]", ","):
+                raise _json_invalid("Expecting ',' delimiter", position)
+            position = _skip_whitespace(text, position + 1)
+            if separator == "]":
+                break
+    if _skip_whitespace(text, position) != len(text):
+        raise _json_invalid("Extra data", position)
+
+def _skip_whitespace(text: str, position: int) -> int:
+    return _WHITESPACE.match(text, position).end()
+
+def _json_invalid(message: str, position: int) -> RequestValidationError:
+    # Same shape as FastAPI reports an unparseable body.
+    return RequestValidationError([{"type": "json_invalid", "loc": ("body", position), "msg": "JSON decode error", "input": {}, "ctx": {"error": message}}])
+
+def parse_requests(body: bytes, ndjson: bool = False) -> list[CalculationRequest]:
+    """Validate a JSON array, or one ``CalculationRequest`` per line, in one pass.
+
+    Every invalid record is reported, located by its index (the line
+    number for NDJSON, counting from 0), as a ``RequestValidationError``.
+    Records are counted as they are parsed, and ``BatchTooLarge`` is raised
+    as soon as there are more than ``BATCH_MAX_ROWS``.
+    """
+    if ndjson:
+        records = ((number, line) for number, line in enumerate(body.splitlines()) if line.strip())
+        validate = _REQUEST.validate_json
+    else:
+        try:
+            text = body.decode()
+        except UnicodeDecodeError as e:
+            raise _json_invalid(str(e), e.start)
+        records = enumerate(_json_array_items(text))
+        validate = _REQUEST.validate_python
+    requests, errors = [], []
+    for count, (number, record) in enumerate(records, 1):
+        if count > BATCH_MAX_ROWS:
+            raise BatchTooLarge(f"batch exceeds the limit of {BATCH_MAX_ROWS} calculations")
+        try:
+            requests.append(validate(record))
+        except ValidationError as e:
+            errors.extend(_body_errors(e, (number,)))
+    if errors:
+        raise RequestValidationError(errors)
+    return requests
+
+def prepare(requests: list[CalculationRequest], statistics: StatisticsSnapshot) -> tuple[list[DbRows], list[Calculation | None]]:
+    """Database rows and engine inputs of ``requests``, ids assigned here.
+
+    Records whose date, time, amounts or job and leave dates cannot be
+    parsed (say, ``31-02-2020``) fail the whole batch, before anything is
+    stored. A record that parses but cannot be mapped onto the engine's
+    ``Calculation`` is still stored, without a pension, as
+    ``POST /calculations`` does.
+    """
+    rows, calcs, errors = [], [], []
+    for index, request in enumerate(requests):
+        calculation_id = str(uuid.uuid4())
+        try:
+            calculation_datetime = datetime.fromisoformat(f"{request.calculationDate}T{request.calculationTime}")
+            rows.append(to_db_rows(request, calculation_id, calculation_datetime))
+        except ValueError as e:
+            errors.append({"type": "value_error", "loc": ("body", index), "msg": str(e), "input": None})
+            continue
+        try:
+            calcs.append(to_calculation(request, calculation_id=calculation_id, calculation_datetime=calculation_datetime, statistics=statistics))
+        except ValueError:
+            calcs.append(None)
+    if errors:
+        raise RequestValidationError(errors)
+    return rows, calcs
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Protocol
+
+from .algorithm import compute_pension_funds_batch
+from .mapper import StatisticsSnapshot, current, registry
+from .models import Calculation
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("PENSION_CACHE_MAX_ENTRIES", "4096"))
+DEFAULT_TTL_SECONDS = float(os.getenv("PENSION_CACHE_TTL_SECONDS", "3600"))
+# After a shared-backend error, only the in-process cache is used for this long.
+BACKEND_RETRY_SECONDS = float(os.getenv("PENSION_CACHE_BACKEND_RETRY_SECONDS", "30"))
+
+def calculation_key(calc: Calculation, statistics_version: str | None = None, now: int | None = None) -> str:
+    """Canonical hash of everything the engine reads from ``calc``.
+
+    Jobs are sorted and leaves are taken from the per-year leave index, so
+    the order they were submitted in does not matter. Fields the engine
+    ignores (id, expected pension, postal code) are left out; the current
+    year is in, since it decides which years count as already funded, and
+    so is the statistics version (the current snapshot's by default).
+    """
+    index = calc.leave_index
+    normalized = {
+        "v": current().version if statistics_version is None else statistics_version,
+        "now": datetime.now().year if now is None else now,
+        "year": calc.calculation_datetime.year,
+        "sex": calc.sex.value,
+        "age": calc.age,
+        "funds": calc.total_accumulated_funds,
+        "retirement": calc.year_desired_retirement,
+        "absence": calc.include_expected_absence,
+        "jobs": sorted((job.start_date, job.end_date, job.base_salary) for job in calc.jobs),
+        "leaves": [index.years.tolist(), index.days.tolist()],
+    }
+    encoded = json.dumps(normalized, separators=(",", ":"), sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+def _encode(result: dict) -> bytes:
+    return json.dumps({
+        "funds_by_year": [[year, nominal, real] for year, (nominal, real) in result["funds_by_year"].items()],
+        "monthly_pension": result["monthly_pension"],
+    }).encode()
+
+def _decode(payload: bytes) -> dict:
+    data = json.loads(payload)
+    return {
+        "funds_by_year": {year: (nominal, real) for year, nominal, real in data["funds_by_year"]},
+        "monthly_pension": data["monthly_pension"],
+    }
+
+class CacheBackend(Protocol):
+    """Shared store behind the in-process LRU, e.g. for several uvicorn workers."""
+    def get(self, key: str) -> bytes | None: ...
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None: ...
+
+class RedisBackend:
+    def __init__(self, url: str, prefix: str = "pension:", timeout_seconds: float = 0.25):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RedisBackend requires the 'redis' package") from e
+        # A short timeout: an unreachable Redis must cost a lookup little more than a miss.
+        self._client = redis.Redis.from_url(url, socket_connect_timeout=timeout_seconds, socket_timeout=timeout_seconds)
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._client.set(self._prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+class PensionCache:
+    """LRU cache of pension results with size and TTL eviction.
+
+    Results are looked up in-process first, then in the optional shared
+    ``backend``; a result computed here is written to both. When the backend
+    fails, it is skipped for ``BACKEND_RETRY_SECONDS`` and the cache works
+    in-process only.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS, backend: CacheBackend | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.backend_errors = 0
+        self._backend_retry_at = 0.0
+
+    def _call_backend(self, method: str, *args):
+        if time.monotonic() < self._backend_retry_at:
+            return None
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception as e:
+            with self._lock:
+                self.backend_errors += 1
+                self._backend_retry_at = time.monotonic() + BACKEND_RETRY_SECONDS
+            print(f"Warning: Shared pension cache unavailable, using the local cache for {BACKEND_RETRY_SECONDS:g}s: {str(e)}")
+            return None
+
+    def get(self, key: str) -> dict | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.evictions += 1
+        if self.backend is not None:
+            payload = self._call_backend("get", key)
+            if payload is not None:
+                result = _decode(payload)
+                self._store(key, result)
+                with self._lock:
+                    self.shared_hits += 1
+                return result
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        self._store(key, result)
+        if self.backend is not None:
+            self._call_backend("set", key, _encode(result), self.ttl_seconds)
+
+    def _store(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(
+        self,
+        calc: Calculation,
+        compute: Callable[[Calculation, StatisticsSnapshot], dict] | None = None,
+        statistics: StatisticsSnapshot | None = None,
+    ) -> dict:
+        """Cached ``compute_pension_funds_batch`` entry for ``calc``. Returned results are shared; do not mutate them.
+
+        The lookup and a computation on a miss both use ``statistics`` (the
+        current snapshot by default), so a result is never stored under
+        another version's key.
+        """
+        statistics = statistics or current()
+        key = calculation_key(calc, statistics.version)
+        result = self.get(key)
+        if result is None:
+            result = compute(calc, statistics) if compute is not None else compute_pension_funds_batch([calc], statistics)[0]
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+def shared_backend(url: str | None) -> CacheBackend | None:
+    """Redis backend for ``url``, or None (in-process caching only) without a URL or the redis package."""
+    if not url:
+        return None
+    try:
+        return RedisBackend(url)
+    except RuntimeError as e:
+        print(f"Warning: Shared pension cache disabled: {str(e)}")
+        return None
+
+pension_cache = PensionCache(backend=shared_backend(os.getenv("PENSION_CACHE_REDIS_URL")))
+# Entries of a replaced statistics version can never be hit again; free them right away.
+registry.on_swap(lambda _: pension_cache.clear())
@@ -0,0 +1,44 @@
+"""Compile every statistics scenario into a memory-mappable pack.
+
+Run after changing statistics.json or the scenario files, e.g. at deploy:
+
+    poetry run hackathon-compile-statistics
+    poetry run hackathon-compile-statistics --output /srv/statistics --prune
+
+Workers then map the packs at startup instead of parsing JSON. A pack is
+named after the hash of its source files and the digest of its body, so
+stale packs are never used; the JSON is parsed again (and a fresh pack
+published) until they are recompiled.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from .mapper import registry
+from .statistics_pack import COMPILED_DIR
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=Path(COMPILED_DIR), help="directory for the packs (default STATISTICS_COMPILED_DIR)")
+    parser.add_argument("--prune", action="store_true", help="delete packs of versions no scenario uses any more")
+    args = parser.parse_args(argv)
+
+    written = set()
+    for name, source in registry.sources().items():
+        try:
+            snapshot = source.parse(name)
+        except (OSError, ValueError) as e:
+            print(f"{name}: {e}", file=sys.stderr)
+            return 1
+        path = snapshot.write_pack(args.output)
+        written.add(path)
+        print(f"{name}: {path} ({path.stat().st_size} bytes)")
+    if args.prune:
+        for path in args.output.glob("*.stats"):
+            if path not in written:
+                path.unlink()
+                print(f"removed {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from datetime import date, datetime
+from typing import NamedTuple
+from uuid import UUID, uuid4
+
+from .algorithm import get_salary
+from .mapper import StatisticsSnapshot
+from .models import Calculation, Job, Leave, LeaveType, Sex
+from .schemas import CalculationRequest
+
+_SEX_MAP = {"male": Sex.MALE, "m": Sex.MALE, "female": Sex.FEMALE, "f": Sex.FEMALE}
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%d-%m-%Y").date()
+
+def _parse_amount(value: str | None) -> float | None:
+    """Currency strings from the API; empty and zero amounts mean "not given"."""
+    if value is None or not value.strip():
+        return None
+    return float(value) or None
+
+def _split_leave(start: date, end: date) -> list[Leave]:
+    """One SICKNESS leave per calendar year covered by ``[start, end]``."""
+    leaves = []
+    for year in range(start.year, end.year + 1):
+        first = max(start, date(year, 1, 1))
+        last = min(end, date(year, 12, 31))
+        leaves.append(Leave(duration_days=(last - first).days + 1, leave_year=year, leave_type=LeaveType.SICKNESS))
+    return leaves
+
+def to_calculation(
+    request: CalculationRequest,
+    calculation_id: UUID | str | None = None,
+    calculation_datetime: datetime | None = None,
+    statistics: StatisticsSnapshot | None = None,
+) -> Calculation:
+    """Map an API ``CalculationRequest`` onto the ``models.Calculation`` the engine works on."""
+    if calculation_datetime is None:
+        calculation_datetime = datetime.fromisoformat(f"{request.calculationDate}T{request.calculationTime}")
+    jobs = [
+        Job(
+            start_date=_parse_date(job.startDate).year,
+            end_date=_parse_date(job.endDate).year if job.endDate else None,
+            base_salary=job.baseSalary,
+        )
+        for job in request.jobs
+    ]
+    salary = _parse_amount(request.salary)
+    if not jobs and salary is not None:
+        # No job history: one open-ended job paying today's salary, projected back to the first year of work.
+        jobs = [Job(
+            start_date=request.yearWorkStart,
+            base_salary=get_salary(salary, calculation_datetime.year, request.yearWorkStart, statistics),
+        )]
+    leaves = []
+    for leave in request.leaves:
+        start = _parse_date(leave.startDate)
+        leaves.extend(_split_leave(start, _parse_date(leave.endDate) if leave.endDate else start))
+    return Calculation(
+        calculation_id=calculation_id or uuid4(),
+        calculation_datetime=calculation_datetime,
+        expected_pension=float(request.expectedPension),
+        age=request.age,
+        sex=_SEX_MAP.get(request.sex.lower(), Sex.MALE),
+        total_accumulated_funds=_parse_amount(request.totalAccumulatedFunds),
+        year_work_start=request.yearWorkStart,
+        year_desired_retirement=request.yearDesiredRetirement,
+        postal_code=request.postalCode,
+        jobs=jobs,
+        leaves=leaves,
+        include_expected_absence=request.isSickLeaveIncluded,
+    )
+
+class DbRows(NamedTuple):
+    """Column values of one stored calculation: its ``calculations`` row and child rows."""
+    calculation: dict
+    jobs: list[dict]
+    leaves: list[dict]
+
+def to_db_rows(request: CalculationRequest, calculation_id: str, calculation_datetime: datetime | None = None) -> DbRows:
+    """Rows storing ``request``; raises ``ValueError`` for dates or amounts that do not parse."""
+    if calculation_datetime is None:
+        calculation_datetime = datetime.fromisoformat(f"{request.calculationDate}T{request.calculationTime}")
+    jobs = []
+    for position, job in enumerate(request.jobs):
+        start = _parse_date(job.startDate)
+        end = _parse_date(job.endDate) if job.endDate else None
+        jobs.append({
+            "calculation_id": calculation_id,
+            "position": position,
+            "start_date": start,
+            "end_date": end,
+            "start_year": start.year,
+            "end_year": end.year if end else None,
+            "base_salary": float(job.baseSalary),
+        })
+    leaves = []
+    for position, leave in enumerate(request.leaves):
+        start = _parse_date(leave.startDate)
+        end = _parse_date(leave.endDate) if leave.endDate else None
+        leaves.append({
+            "calculation_id": calculation_id,
+            "position": position,
+            "start_date": start,
+            "end_date": end,
+            "start_year": start.year,
+            "end_year": (end or start).year,
+        })
+    calculation = {
+        "calculation_id": calculation_id,
+        "calculation_datetime": calculation_datetime,
+        "expected_pension": float(request.expectedPension),
+        "age": request.age,
+        # Parsed as to_calculation does, so the stored row matches what was priced.
+        "sex": _SEX_MAP.get(request.sex.lower(), Sex.MALE).value,
+        "total_accumulated_funds": _parse_amount(request.totalAccumulatedFunds),
+        "year_work_start": request.yearWorkStart,
+        "year_desired_retirement": request.yearDesiredRetirement,
+        "postal_code": request.postalCode,
+    }
+    return DbRows(calculation, jobs, leaves)
@@ -0,0 +1,156 @@
+"""Database engines and sessions, configured from the environment.
+
+SQLite connections get their pragmas (WAL journal, synchronous level,
+mmap and page cache size, busy timeout) on connect. Server databases get
+a sized, pre-pinged and recycled pool. With ``DATABASE_READ_URL`` set,
+read-only endpoints are served from that replica; everything else, and
+every write, goes to ``DATABASE_URL``.
+"""
+import os
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Engine, create_engine, event, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from .models import DbCalculation, DbJob, DbLeave
+
+if TYPE_CHECKING:
+    from .converters import DbRows
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///hackathon.db")
+# Optional read replica for GET endpoints; reads may lag writes by the replication delay.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL") or None
+
+# Connections each engine keeps open and how many more it may open under
+# load; requests beyond that wait (up to the timeout) for a free connection.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Server databases only: test connections before use and replace them before the server drops them.
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes", "on")
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
+# Applied to every new SQLite connection, in this order; an empty value skips the pragma.
+# WAL lets readers run alongside the single writer, and synchronous=NORMAL only
+# fsyncs at checkpoints (a crash can lose the last commits, never corrupt the file).
+SQLITE_PRAGMAS = {
+    name: value
+    for name, value in {
+        "journal_mode": os.getenv("DB_SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("DB_SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        "mmap_size": os.getenv("DB_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        # Negative: size in KiB rather than pages.
+        "cache_size": os.getenv("DB_SQLITE_CACHE_SIZE", str(-64 * 1024)),
+        "foreign_keys": os.getenv("DB_SQLITE_FOREIGN_KEYS", "ON"),
+    }.items()
+    if value
+}
+
+# Async driver used for each backend of DATABASE_URL.
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+def async_url(url: str) -> str:
+    """``url`` with the async driver of its backend, e.g. ``sqlite+aiosqlite://``.
+
+    URLs that already name an async driver, or whose backend has none
+    configured, are returned unchanged.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS or parsed.get_driver_name() in _ASYNC_DRIVERS.values():
+        return url
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _engine_options(url: str) -> dict:
+    parsed = make_url(url)
+    if _is_sqlite(url):
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory SQLite lives in a single connection; there is no pool to size.
+            return {}
+        return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT_SECONDS}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+    }
+
+def _set_sqlite_pragmas(engine: Engine, pragmas: dict[str, str]) -> None:
+    @event.listens_for(engine, "connect")
+    def apply(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+def build_engine(url: str, sqlite_pragmas: dict[str, str] = SQLITE_PRAGMAS) -> Engine:
+    """Synchronous engine for ``url`` with the configured pool, or pragmas for SQLite."""
+    if not _is_sqlite(url):
+        return create_engine(url, **_engine_options(url))
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **_engine_options(url))
+    _set_sqlite_pragmas(engine, sqlite_pragmas)
+    return engine
+
+def build_async_engine(url: str, sqlite_pragmas: dict[str, str] = SQLITE_PRAGMAS) -> AsyncEngine:
+    """Async engine for ``url`` (already naming an async driver), configured as ``build_engine``."""
+    engine = create_async_engine(url, **_engine_options(url))
+    if _is_sqlite(url):
+        _set_sqlite_pragmas(engine.sync_engine, sqlite_pragmas)
+    return engine
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_url(DATABASE_URL)
+ASYNC_DATABASE_READ_URL = os.getenv("ASYNC_DATABASE_READ_URL") or (async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None)
+
+# Synchronous engine for scripts, migrations and the streaming export.
+engine = build_engine(DATABASE_URL)
+read_engine = build_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Calculation endpoints await queries here instead of holding a threadpool worker.
+async_engine = build_async_engine(ASYNC_DATABASE_URL)
+async_read_engine = build_async_engine(ASYNC_DATABASE_READ_URL) if ASYNC_DATABASE_READ_URL else async_engine
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """Session on the read replica when one is configured, the primary otherwise."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def dispose_engines() -> None:
+    for async_db_engine in {async_engine, async_read_engine}:
+        await async_db_engine.dispose()
+    for db_engine in {engine, read_engine}:
+        db_engine.dispose()
+
+async def store_calculations(db: AsyncSession, rows: list["DbRows"]) -> None:
+    """Insert calculations with their jobs and leaves, one executemany per table; the caller commits."""
+    # Core inserts on the tables: the ORM bulk path costs several times more per row and builds nothing we use.
+    await db.execute(insert(DbCalculation.__table__), [row.calculation for row in rows])
+    jobs = [job for row in rows for job in row.jobs]
+    if jobs:
+        await db.execute(insert(DbJob.__table__), jobs)
+    leaves = [leave for row in rows for leave in row.leaves]
+    if leaves:
+        await db.execute(insert(DbLeave.__table__), leaves)
@@ -1,30 +1,57 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker
-import io
-import pandas as pd
+from typing import List, Literal, Optional, Union
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from .schemas import (
-    DatabaseItemsResponse, DatabaseItemResponse, HealthCheckResponse, 
-    ErrorResponse, StatisticsResponse, StatisticsDataResponse, LifeExpectancyResponse, LifeExpectancyData,
+    DatabaseItemsResponse, DatabaseItemResponse, HealthCheckResponse, CacheStatsResponse, StatisticsVersionResponse,
+    ErrorResponse, StatisticsResponse, StatisticsDataResponse, LifeExpectancyResponse, StatisticsColumnsResponse,
     CalculationRequest, CalculationResponse, AnalysisResponse, AnalysisErrorResponse,
     ChatMessage, ChatResponse, ChatErrorResponse, OwlInfoResponse,
-    CalculationDetail, CalculationAdminDetail, PaginatedCalculationsResponse
+    CalculationDetail, CalculationAdminDetail, PaginatedCalculationsResponse, GoalSolutionResponse, CalculationBatchResponse,
+    ActiveJobsResponse, SalaryByStartYearResponse
 )
-from .models import DbCalculation, Job as DbJob, Leave as DbLeave
-from .schemas import Job as JobSchema, Leave as LeaveSchema
-from .mapper import GROWTH, AVERAGE_WAGE, VALORIZATION, INFLATION, LIFE_EXPECTANCY, LIFE_EXPECTANCY_MALE, LIFE_EXPECTANCY_FEMALE, META
+from .models import DbCalculation
+from .analytics import average_base_salary_by_start_year, count_calculations_with_job_active_in
+from .algorithm import get_real_value
+from .cache import pension_cache
+from .workers import PensionPoolBusy, compute_pension, shutdown_pool, start_pool, submit_pension_batch
+from .batch import BATCH_CHUNK_SIZE, BatchTooLarge, is_ndjson, parse_requests, prepare as prepare_batch
+from .converters import to_calculation, to_db_rows
+from .database import ReadSessionLocal, dispose_engines, get_async_db, get_async_read_db, store_calculations
+from .pagination import SORT_KEY, Cursor, approximate_count, keyset_page
+from .write_buffer import get_write_buffer, start_write_buffer, stop_write_buffer
+from .xlsx_stream import MEDIA_TYPE as XLSX_MEDIA_TYPE, stream_xlsx
+from .solver import solve_salary_multiplier, solve_retirement_year
+from .statistics_responses import (
+    SERIES_NAMES, StatisticsQuery, respond as respond_statistics, response_cache as statistics_response_cache,
+)
+from .mapper import StatisticsSnapshot, UnknownScenario, current as current_statistics, registry as statistics_registry
+import asyncio
 import uuid
 import os
+from contextlib import asynccontextmanager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for statistics in statistics_registry.scenarios().values():
+        statistics_response_cache.warm(statistics)
+    statistics_registry.start_polling()
+    start_write_buffer()
+    start_pool()
+    yield
+    await stop_write_buffer()
+    statistics_registry.stop_polling()
+    shutdown_pool()
+    await dispose_engines()
 
-app = FastAPI(title="Hackathon API")
+app = FastAPI(title="Hackathon API", lifespan=lifespan)
 
 # Enable CORS for all origins for development
 app.add_middleware(
@@ -36,39 +63,65 @@ app.add_middleware(
 )
 
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///hackathon.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_statistics_snapshot(
+    scenario: Optional[str] = Query(None, description="Named statistics scenario (the default one when omitted)"),
+) -> StatisticsSnapshot:
+    try:
+        return current_statistics(scenario)
+    except UnknownScenario:
+        raise HTTPException(status_code=404, detail=f"Unknown statistics scenario: {scenario}")
+
+def get_statistics_query(
+    from_year: Optional[int] = Query(None, alias="from", description="First year (inclusive)"),
+    to_year: Optional[int] = Query(None, alias="to", description="Last year (inclusive)"),
+    series: Optional[str] = Query(None, description=f"Comma-separated series, /statistics only: {', '.join(SERIES_NAMES)}"),
+    step: int = Query(1, ge=1, le=100, description="Keep every n-th year, counted from `from`"),
+    format: Literal["rows", "columns"] = Query("rows", description='"columns" returns {"years": [...], "values": {...}}'),
+) -> StatisticsQuery:
+    if from_year is not None and to_year is not None and from_year > to_year:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    selected = None
+    if series is not None:
+        selected = tuple(sorted({name.strip() for name in series.split(",") if name.strip()}))
+        unknown = sorted(set(selected) - set(SERIES_NAMES))
+        if unknown or not selected:
+            raise HTTPException(status_code=422, detail=f"Unknown statistics series: {', '.join(unknown) or series}")
+    return StatisticsQuery(from_year, to_year, step, selected, format == "columns")
 
-def get_db():
-    db = SessionLocal()
+def _respond_statistics(request: Request, statistics: StatisticsSnapshot, route: str, query: StatisticsQuery):
     try:
-        yield db
-    finally:
-        db.close()
+        return respond_statistics(request, statistics, route, query)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 # --- Health ---
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     return HealthCheckResponse(status="healthy", timestamp=datetime.now())
 
+@app.get("/health/cache", response_model=CacheStatsResponse)
+async def cache_stats():
+    return CacheStatsResponse(**pension_cache.stats())
+
+@app.get("/health/statistics", response_model=StatisticsVersionResponse)
+async def statistics_version(statistics: StatisticsSnapshot = Depends(get_statistics_snapshot)):
+    return _statistics_version(statistics)
+
+def _statistics_version(statistics: StatisticsSnapshot) -> StatisticsVersionResponse:
+    return StatisticsVersionResponse(scenario=statistics.scenario, version=statistics.version, meta=dict(statistics.meta))
+
 # --- Statistics ---
-@app.get("/statistics", response_model=StatisticsResponse)
-async def get_statistics():
+# Bodies are rendered once per statistics version and query and served with ETags (304 on If-None-Match) and gzip.
+@app.get("/statistics", response_model=Union[StatisticsResponse, StatisticsColumnsResponse])
+async def get_statistics(
+    request: Request,
+    statistics: StatisticsSnapshot = Depends(get_statistics_snapshot),
+    query: StatisticsQuery = Depends(get_statistics_query),
+):
     try:
-        meta_data = dict(META) if any(META.values()) else None
-        life_expectancy_data = LifeExpectancyData(
-            male=[StatisticsDataResponse(year=year, value=value) for year, value in LIFE_EXPECTANCY_MALE.items()],
-            female=[StatisticsDataResponse(year=year, value=value) for year, value in LIFE_EXPECTANCY_FEMALE.items()]
-        )
-        return StatisticsResponse(
-            growth_rate=[StatisticsDataResponse(year=y, value=v) for y, v in GROWTH.items()],
-            average_wage=[StatisticsDataResponse(year=y, value=v) for y, v in AVERAGE_WAGE.items()],
-            valorization=[StatisticsDataResponse(year=y, value=v) for y, v in VALORIZATION.items()],
-            inflation=[StatisticsDataResponse(year=y, value=v) for y, v in INFLATION.items()],
-            life_expectancy=life_expectancy_data,
-            meta=meta_data
-        )
+        return _respond_statistics(request, statistics, "statistics", query)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading statistics: {str(e)}")
 
@@ -77,39 +130,42 @@ async def get_statistics():
 def root():
     return {"message": "Hello from Hackathon!"}
 
-@app.get("/statistics/growth-rate", response_model=List[StatisticsDataResponse])
-async def get_growth_rate():
-    return [StatisticsDataResponse(year=y, value=v) for y, v in GROWTH.items()]
+@app.get("/statistics/scenarios", response_model=List[StatisticsVersionResponse])
+async def get_statistics_scenarios():
+    return [_statistics_version(statistics) for statistics in statistics_registry.scenarios().values()]
 
-@app.get("/statistics/average-wage", response_model=List[StatisticsDataResponse])
-async def get_average_wage():
-    return [StatisticsDataResponse(year=y, value=v) for y, v in AVERAGE_WAGE.items()]
+@app.get("/statistics/growth-rate", response_model=Union[List[StatisticsDataResponse], StatisticsColumnsResponse])
+async def get_growth_rate(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "growth-rate", query)
 
-@app.get("/statistics/valorization", response_model=List[StatisticsDataResponse])
-async def get_valorization():
-    return [StatisticsDataResponse(year=y, value=v) for y, v in VALORIZATION.items()]
+@app.get("/statistics/average-wage", response_model=Union[List[StatisticsDataResponse], StatisticsColumnsResponse])
+async def get_average_wage(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "average-wage", query)
 
-@app.get("/statistics/inflation", response_model=List[StatisticsDataResponse])
-async def get_inflation():
-    return [StatisticsDataResponse(year=y, value=v) for y, v in INFLATION.items()]
+@app.get("/statistics/valorization", response_model=Union[List[StatisticsDataResponse], StatisticsColumnsResponse])
+async def get_valorization(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "valorization", query)
 
-@app.get("/statistics/life-expectancy", response_model=List[LifeExpectancyResponse])
-async def get_life_expectancy(gender: str = "M"):
-    if gender.upper() == "F":
-        data = LIFE_EXPECTANCY_FEMALE
-        gender_label = "Female"
-    else:
-        data = LIFE_EXPECTANCY_MALE
-        gender_label = "Male"
-    return [LifeExpectancyResponse(year=year, value=value, gender=gender_label) for year, value in data.items()]
+@app.get("/statistics/inflation", response_model=Union[List[StatisticsDataResponse], StatisticsColumnsResponse])
+async def get_inflation(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "inflation", query)
+
+@app.get("/statistics/life-expectancy", response_model=Union[List[LifeExpectancyResponse], StatisticsColumnsResponse])
+async def get_life_expectancy(
+    request: Request,
+    gender: str = "M",
+    statistics: StatisticsSnapshot = Depends(get_statistics_snapshot),
+    query: StatisticsQuery = Depends(get_statistics_query),
+):
+    return _respond_statistics(request, statistics, "life-expectancy/female" if gender.upper() == "F" else "life-expectancy/male", query)
 
-@app.get("/statistics/life-expectancy/male", response_model=List[LifeExpectancyResponse])
-async def get_life_expectancy_male():
-    return [LifeExpectancyResponse(year=year, value=value, gender="Male") for year, value in LIFE_EXPECTANCY_MALE.items()]
+@app.get("/statistics/life-expectancy/male", response_model=Union[List[LifeExpectancyResponse], StatisticsColumnsResponse])
+async def get_life_expectancy_male(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "life-expectancy/male", query)
 
-@app.get("/statistics/life-expectancy/female", response_model=List[LifeExpectancyResponse])
-async def get_life_expectancy_female():
-    return [LifeExpectancyResponse(year=year, value=value, gender="Female") for year, value in LIFE_EXPECTANCY_FEMALE.items()]
+@app.get("/statistics/life-expectancy/female", response_model=Union[List[LifeExpectancyResponse], StatisticsColumnsResponse])
+async def get_life_expectancy_female(request: Request, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot), query: StatisticsQuery = Depends(get_statistics_query)):
+    return _respond_statistics(request, statistics, "life-expectancy/female", query)
 
 # --- Global error handler ---
 @app.exception_handler(Exception)
@@ -129,21 +185,36 @@ async def global_exception_handler(request, exc):
     response_model=PaginatedCalculationsResponse,
     status_code=200,
 )
-def list_calculations(
-    page: int = Query(1, ge=1, description="Page number (starting from 1)"),
+async def list_calculations(
+    cursor: Optional[str] = Query(None, description="nextCursor or prevCursor of a previous page"),
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db)
+    total: Literal["none", "approximate", "exact"] = Query("none", description="Include totalItems/totalPages; exact counts every row"),
+    page: Optional[int] = Query(None, ge=1, description="Deprecated: page number (starting from 1); cost grows with the page, use cursor instead"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """List all submitted calculations with pagination"""
+    """List submitted calculations, newest first, one keyset page at a time"""
     try:
-        # Calculate offset
-        offset = (page - 1) * limit
-        
-        # Get total count
-        total_items = db.query(DbCalculation).count()
-        
-        # Get calculations with pagination
-        calculations = db.query(DbCalculation).offset(offset).limit(limit).all()
+        decoded = Cursor.decode(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        query = select(DbCalculation)
+        if page is not None and decoded is None:
+            # Legacy offset paging, kept for existing clients; ordered so pages no longer overlap.
+            calculations = list(await db.scalars(query.order_by(*(column.desc() for column in SORT_KEY)).offset((page - 1) * limit).limit(limit)))
+            next_cursor = Cursor.at(calculations[-1], "next").encode() if len(calculations) == limit else None
+            prev_cursor = Cursor.at(calculations[0], "prev").encode() if page > 1 and calculations else None
+            if total == "none":
+                total = "exact"
+        else:
+            page = None
+            calculations, next_cursor, prev_cursor = await keyset_page(db, query, limit, decoded)
+
+        total_items = None
+        if total == "exact":
+            total_items = await db.scalar(select(func.count(DbCalculation.calculation_id)))
+        elif total == "approximate":
+            total_items = await approximate_count(db)
         
         # Convert to response format
         submissions = []
@@ -170,80 +241,79 @@ def list_calculations(
             )
             submissions.append(submission)
         
-        # Calculate total pages
-        total_pages = (total_items + limit - 1) // limit
-        
         return PaginatedCalculationsResponse(
             submissions=submissions,
-            page=page,
             pageSize=limit,
+            nextCursor=next_cursor,
+            prevCursor=prev_cursor,
+            page=page,
             totalItems=total_items,
-            totalPages=total_pages
+            totalPages=(total_items + limit - 1) // limit if total_items is not None else None,
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving calculations: {str(e)}")
 
 
+EXPORT_COLUMNS = [
+    'ID Obliczenia', 'Data', 'Czas', 'Wiek', 'Płeć',
+    'Oczekiwana Emerytura', 'Zgromadzone Środki',
+    'Rok Rozpoczęcia Pracy', 'Rok Planowanej Emerytury', 'Kod Pocztowy'
+]
+# Rows fetched from the database per round trip while exporting.
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "500"))
+
+def _export_rows():
+    # The export outlives the request handler, so it reads through its own session.
+    db = ReadSessionLocal()
+    try:
+        query = db.query(DbCalculation).order_by(*SORT_KEY).yield_per(EXPORT_CHUNK_ROWS)
+        for calc in query:
+            yield (
+                calc.calculation_id,
+                calc.calculation_datetime.strftime('%Y-%m-%d'),
+                calc.calculation_datetime.strftime('%H:%M:%S'),
+                calc.age,
+                'Kobieta' if calc.sex == 'F' else 'Mężczyzna',
+                calc.expected_pension,
+                calc.total_accumulated_funds or 0,
+                calc.year_work_start,
+                calc.year_desired_retirement,
+                calc.postal_code or '',
+            )
+    finally:
+        db.close()
+
 @app.get(
     "/calculations/export",
     status_code=200,
 )
 def download_all_calculations(
     lang: str = Query("pl-PL", description="Language for the exported file"),
-    db: Session = Depends(get_db)
 ):
-    """Download all submitted calculations in XLS format"""
-    try:
-        # Get all calculations
-        calculations = db.query(DbCalculation).all()
-        
-        if not calculations:
-            # Return empty XLS file
-            df = pd.DataFrame(columns=[
-                'ID Obliczenia', 'Data', 'Czas', 'Wiek', 'Płeć', 
-                'Oczekiwana Emerytura', 'Zgromadzone Środki',
-                'Rok Rozpoczęcia Pracy', 'Rok Planowanej Emerytury', 'Kod Pocztowy'
-            ])
-        else:
-            # Prepare data for export
-            data = []
-            for calc in calculations:
-                # Format datetime
-                calc_date = calc.calculation_datetime.strftime('%Y-%m-%d')
-                calc_time = calc.calculation_datetime.strftime('%H:%M:%S')
-                
-                data.append({
-                    'ID Obliczenia': calc.calculation_id,
-                    'Data': calc_date,
-                    'Czas': calc_time,
-                    'Wiek': calc.age,
-                    'Płeć': 'Kobieta' if calc.sex == 'F' else 'Mężczyzna',
-                    'Oczekiwana Emerytura': calc.expected_pension,
-                    'Zgromadzone Środki': calc.total_accumulated_funds or 0,
-                    'Rok Rozpoczęcia Pracy': calc.year_work_start,
-                    'Rok Planowanej Emerytury': calc.year_desired_retirement,
-                    'Kod Pocztowy': calc.postal_code or ''
-                })
-            
-            df = pd.DataFrame(data)
-        
-        # Create XLS file in memory
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Obliczenia Emerytur', index=False)
-        output.seek(0)
-        # Use StreamingResponse for file download
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": f"attachment; filename=obliczenia-emerytur-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
-            }
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating XLS file: {str(e)}")
+    """Download all submitted calculations in XLS format, streamed as rows are read"""
+    return StreamingResponse(
+        stream_xlsx('Obliczenia Emerytur', EXPORT_COLUMNS, _export_rows(), EXPORT_CHUNK_ROWS),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f"attachment; filename=obliczenia-emerytur-{datetime.now().strftime('%Y-%m-%d')}.xlsx"
+        }
+    )
+
+
+@app.get("/calculations/analytics/active-jobs", response_model=ActiveJobsResponse)
+async def get_active_jobs(
+    year: int = Query(..., ge=1900, le=2200, description="Count calculations with a job active in this year"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return ActiveJobsResponse(year=year, calculations=await count_calculations_with_job_active_in(db, year))
+
+@app.get("/calculations/analytics/salary-by-start-year", response_model=List[SalaryByStartYearResponse])
+async def get_salary_by_start_year(db: AsyncSession = Depends(get_async_read_db)):
+    return [
+        SalaryByStartYearResponse(startYear=start_year, jobs=jobs, averageBaseSalary=average)
+        for start_year, jobs, average in await average_base_salary_by_start_year(db)
+    ]
 
 
 @app.get(
@@ -251,10 +321,10 @@ def download_all_calculations(
     response_model=CalculationDetail,
     status_code=200,
 )
-def get_calculation_by_id(calculation_id: str, db: Session = Depends(get_db)):
+async def get_calculation_by_id(calculation_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get detailed calculation by ID"""
     try:
-        calculation = db.query(DbCalculation).filter(DbCalculation.calculation_id == calculation_id).first()
+        calculation = await db.get(DbCalculation, calculation_id)
         
         if not calculation:
             raise HTTPException(status_code=404, detail="Calculation not found")
@@ -291,78 +361,131 @@ def get_calculation_by_id(calculation_id: str, db: Session = Depends(get_db)):
     response_model=CalculationResponse,
     status_code=201,
 )
-def submit_calculation(request: CalculationRequest, db: Session = Depends(get_db)):
+async def submit_calculation(
+    request: CalculationRequest,
+    db: AsyncSession = Depends(get_async_db),
+    statistics: StatisticsSnapshot = Depends(get_statistics_snapshot),
+):
     calculation_id = str(uuid.uuid4())
     
-    # Map sex from 'male'/'female' to 'M'/'F'
-    sex_map = {'male': 'M', 'female': 'F'}
-    sex_value = sex_map.get(request.sex.lower(), 'M')
-    
-    # Parse datetime
-    calculation_datetime = datetime.fromisoformat(f"{request.calculationDate}T{request.calculationTime}")
-    
-    # Convert jobs and leaves to JSON
-    jobs_json = [job.dict() for job in request.jobs]
-    leaves_json = [leave.dict() for leave in request.leaves]
-    
-    # Create calculation record
-    calculation = DbCalculation(
-        calculation_id=calculation_id,
-        calculation_datetime=calculation_datetime,
-        expected_pension=float(request.expectedPension),
-        age=request.age,
-        sex=sex_value,
-        total_accumulated_funds=float(request.totalAccumulatedFunds) if request.totalAccumulatedFunds else None,
-        year_work_start=request.yearWorkStart,
-        year_desired_retirement=request.yearDesiredRetirement,
-        postal_code=request.postalCode,
-        jobs=jobs_json,
-        leaves=leaves_json,
-    )
-    
-    db.add(calculation)
-    db.commit()
-    db.refresh(calculation)
+    # Create calculation record; the id is ours, so nothing needs to be read back
+    try:
+        calculation_datetime = datetime.fromisoformat(f"{request.calculationDate}T{request.calculationTime}")
+        row = to_db_rows(request, calculation_id, calculation_datetime)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid calculation input: {str(e)}")
+    write_buffer = get_write_buffer()
+    if write_buffer is not None:
+        # Committed in one transaction with concurrent submissions
+        await write_buffer.add(row)
+    else:
+        await store_calculations(db, [row])
+        await db.commit()
     
-    # Calculate pension using simplified algorithm
+    # Calculate pension with the full engine on the process pool
     try:
-        # Simple calculation based on expected pension and average wage
-        expected_pension_value = float(request.expectedPension)
-        avg_wage_retirement = AVERAGE_WAGE.get(request.yearDesiredRetirement, 5000)
-        
-        # Calculate nominal pension (simple projection)
-        # This is a simplified calculation - full algorithm would use compute_pension_funds
-        years_to_retirement = request.yearDesiredRetirement - request.yearWorkStart
-        
-        # Simple formula: expected pension with growth factor
-        nominal_pension = expected_pension_value
-        
-        # Real pension (adjusted for inflation to today's value)
-        # Simplified: assume 2.5% annual inflation
-        inflation_years = request.yearDesiredRetirement - datetime.now().year
-        inflation_factor = (1.025 ** inflation_years) if inflation_years > 0 else 1
-        real_pension = nominal_pension / inflation_factor
-        
-        # Replacement rate (as percentage of average wage)
-        replacement_rate = (nominal_pension / avg_wage_retirement * 100) if avg_wage_retirement > 0 else 0
-        
-        return CalculationResponse(
-            calculationId=calculation.calculation_id,
-            nominalPension=f"{nominal_pension:.2f}",
-            realPension=f"{real_pension:.2f}",
-            replacementRate=replacement_rate,
-            averageWage=avg_wage_retirement
-        )
+        calc = to_calculation(request, calculation_id=calculation_id, calculation_datetime=calculation_datetime, statistics=statistics)
+        # The pool wait (and a shared cache lookup) blocks, so it stays off the event loop.
+        monthly_pension = (await run_in_threadpool(compute_pension, calc, statistics=statistics))["monthly_pension"]
+        if monthly_pension is None:
+            raise ValueError("career is not eligible for a pension")
+        return _pension_response(calculation_id, request, monthly_pension["nominal"], statistics)
     except Exception as e:
         # If calculation fails, return without pension data
         print(f"Warning: Pension calculation failed: {str(e)}")
-        return CalculationResponse(
-            calculationId=calculation.calculation_id,
-            nominalPension=None,
-            realPension=None,
-            replacementRate=None,
-            averageWage=None
+        return CalculationResponse(calculationId=calculation_id)
+
+
+@app.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    status_code=201,
+)
+async def submit_calculation_batch(
+    request: Request,
+    chunk_size: int = Query(BATCH_CHUNK_SIZE, alias="chunkSize", ge=1, le=10_000, description="Rows per insert statement and pricing batch"),
+    db: AsyncSession = Depends(get_async_db),
+    statistics: StatisticsSnapshot = Depends(get_statistics_snapshot),
+):
+    """Store many calculations at once: a JSON array of CalculationRequest, or NDJSON with one per line
+
+    The batch is stored in one transaction, so a failure leaves none of it behind and it can simply be retried.
+    """
+    body = await request.body()
+    try:
+        # Validation of a large batch is CPU-bound; keep it off the event loop.
+        requests = await run_in_threadpool(parse_requests, body, is_ndjson(request.headers.get("content-type", "")))
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    rows, calcs = await run_in_threadpool(prepare_batch, requests, statistics)
+
+    results = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = range(start, min(start + chunk_size, len(rows)))
+        priced = [index for index in chunk if calcs[index] is not None]
+        try:
+            # The pool prices the chunk while it is being inserted.
+            pensions = asyncio.wrap_future(submit_pension_batch([calcs[index] for index in priced], statistics)) if priced else None
+        except PensionPoolBusy as e:
+            print(f"Warning: Pension calculation failed: {str(e)}")
+            pensions = None
+        await store_calculations(db, rows[start:chunk.stop])
+
+        nominal = {}
+        if pensions is not None:
+            try:
+                nominal = {index: result["monthly_pension"]["nominal"] for index, result in zip(priced, await pensions) if result["monthly_pension"]}
+            except Exception as e:
+                print(f"Warning: Pension calculation failed: {str(e)}")
+        for index in chunk:
+            calculation_id = rows[index].calculation["calculation_id"]
+            if index in nominal:
+                results.append(_pension_response(calculation_id, requests[index], nominal[index], statistics))
+            else:
+                results.append(CalculationResponse(calculationId=calculation_id))
+    await db.commit()
+    return CalculationBatchResponse(inserted=len(rows), results=results)
+
+
+def _pension_response(calculation_id: str, request: CalculationRequest, nominal_pension: float, statistics: StatisticsSnapshot) -> CalculationResponse:
+    # Real pension in today's money
+    real_pension = get_real_value(nominal_pension, request.yearDesiredRetirement, statistics=statistics)
+    
+    # Replacement rate (as percentage of average wage)
+    avg_wage_retirement = statistics.average_wage.get(request.yearDesiredRetirement, 5000)
+    replacement_rate = (nominal_pension / avg_wage_retirement * 100) if avg_wage_retirement > 0 else 0
+    
+    return CalculationResponse(
+        calculationId=calculation_id,
+        nominalPension=f"{nominal_pension:.2f}",
+        realPension=f"{real_pension:.2f}",
+        replacementRate=replacement_rate,
+        averageWage=avg_wage_retirement
+    )
+
+
+@app.post(
+    "/calculations/solve",
+    response_model=GoalSolutionResponse,
+    status_code=200,
+)
+def solve_calculation_goal(request: CalculationRequest, statistics: StatisticsSnapshot = Depends(get_statistics_snapshot)):
+    """Find the salary multiplier or the earliest retirement year that reaches expectedPension"""
+    try:
+        calc = to_calculation(request, statistics=statistics)
+        multiplier = solve_salary_multiplier(calc, calc.expected_pension, statistics=statistics)
+        salary = float(request.salary) if request.salary.strip() else None
+        return GoalSolutionResponse(
+            expectedPension=f"{calc.expected_pension:.2f}",
+            salaryMultiplier=multiplier,
+            requiredSalary=f"{salary * multiplier:.2f}" if salary is not None and multiplier is not None else None,
+            earliestRetirementYear=solve_retirement_year(calc, calc.expected_pension, statistics=statistics),
         )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid calculation input: {str(e)}")
+    except KeyError as e:
+        # A year the solvers' range check let through but the statistics tables lack.
+        raise HTTPException(status_code=422, detail=f"Invalid calculation input: no statistics for year {e.args[0]}")
 
 # --- Analysis & Chat endpoints (kept) ---
 @app.post("/calculations/analyze", response_model=AnalysisResponse, status_code=200)
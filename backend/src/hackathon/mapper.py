@@ -1,28 +1,481 @@
+import hashlib
 import json
+import os
+import threading
+from collections.abc import Callable, Mapping
+from functools import lru_cache
 from pathlib import Path
 from types import MappingProxyType
 
-FILE = Path("statistics.json")
+import numpy as np
 
-def _freeze_year_map(d: dict) -> dict:
-    return MappingProxyType({int(k): float(v) for k, v in d.items()})
+from .statistics_pack import find_pack, read_pack, shared_dir, verify_pack, write_pack
 
-with FILE.open("r", encoding="utf-8") as f:
-    raw = json.load(f)
+# Resolved against the backend directory rather than the working directory.
+FILE = Path(os.getenv("STATISTICS_FILE", Path(__file__).resolve().parents[2] / "statistics.json"))
+# Extra named scenarios: {"name": {"file": ..., "series": {"growth_rate": ..., ...}, "meta": {...}}}, paths relative to the manifest.
+SCENARIOS_FILE = Path(os.getenv("STATISTICS_SCENARIOS", Path(__file__).resolve().parents[2] / "statistics_scenarios.json"))
+DEFAULT_SCENARIO = os.getenv("STATISTICS_DEFAULT_SCENARIO", "default")
+POLL_SECONDS = float(os.getenv("STATISTICS_POLL_SECONDS", "5"))
 
-GROWTH             = _freeze_year_map(raw["growth_rate"])
-AVERAGE_WAGE       = _freeze_year_map(raw["average_wage"])
-VALORIZATION       = _freeze_year_map(raw["valorization"])
-INFLATION          = _freeze_year_map(raw["inflation"])
-LIFE_EXPECTANCY    = _freeze_year_map(raw["life_expectancy"])
+class YearSeries(Mapping):
+    """Read-only yearly series backed by a contiguous float64 array.
 
-# For now, use the same life expectancy data for both genders
-# In a real application, you'd have separate data for male/female
-LIFE_EXPECTANCY_MALE = LIFE_EXPECTANCY
-LIFE_EXPECTANCY_FEMALE = LIFE_EXPECTANCY
+    Behaves like the ``{year: value}`` dict it replaces (lookups, ``items()``,
+    ``get``) while ``window`` hands vectorized code a zero-copy slice.
+    """
+    __slots__ = ("first_year", "values")
 
-# Handle nested structure for average_leave
-EXPECTED_ABSENCE_FEMALE = _freeze_year_map(raw["average_leave"]["F"])
-EXPECTED_ABSENCE_MALE = _freeze_year_map(raw["average_leave"]["M"])
+    def __init__(self, first_year: int, values):
+        # Read-only float64 arrays (e.g. views of a shared pack) are used as they are.
+        if not (isinstance(values, np.ndarray) and values.dtype == np.float64 and not values.flags.writeable):
+            values = np.array(values, dtype=np.float64)
+            values.flags.writeable = False
+        self.first_year = first_year
+        self.values = values
 
-META               = MappingProxyType({"scenario": raw.get("scenario",""), "prepared_on": raw.get("prepared_on","")})
+    @classmethod
+    def from_json(cls, d: dict) -> "YearSeries":
+        years = sorted(int(k) for k in d)
+        if years != list(range(years[0], years[-1] + 1)):
+            raise ValueError("year series must cover a contiguous range of years")
+        return cls(years[0], [float(d[str(year)]) for year in years])
+
+    @property
+    def end_year(self) -> int:
+        """First year past the series."""
+        return self.first_year + len(self.values)
+
+    def __getitem__(self, year: int) -> float:
+        offset = year - self.first_year
+        if 0 <= offset < len(self.values):
+            return self.values.item(offset)
+        raise KeyError(year)
+
+    def __contains__(self, year) -> bool:
+        return isinstance(year, (int, np.integer)) and 0 <= year - self.first_year < len(self.values)
+
+    def __iter__(self):
+        return iter(range(self.first_year, self.end_year))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def window(self, start_year: int, end_year: int) -> np.ndarray:
+        """Values for ``start_year`` (inclusive) to ``end_year`` (exclusive), as a read-only view."""
+        if not self.first_year <= start_year <= end_year <= self.end_year:
+            raise KeyError(start_year if start_year < self.first_year else end_year - 1)
+        return self.values[start_year - self.first_year:end_year - self.first_year]
+
+class CumulativeIndex:
+    """Prefix products of ``1 + rate`` over a contiguous yearly rate series.
+
+    ``level(y)`` is the product of the factors of every year before ``y``, so
+    compounding a value from one year to another is a single division.
+    """
+    __slots__ = ("first_year", "last_year", "_levels")
+
+    def __init__(self, rates: YearSeries):
+        self.first_year = rates.first_year
+        self.last_year = rates.end_year
+        levels = np.ones(len(rates) + 1)
+        np.cumprod(1 + rates.values, out=levels[1:])
+        levels.flags.writeable = False
+        self._levels = levels
+
+    @classmethod
+    def from_levels(cls, first_year: int, levels: np.ndarray) -> "CumulativeIndex":
+        """Index over precomputed, read-only ``levels`` (one more than there are rate years)."""
+        index = cls.__new__(cls)
+        index.first_year = first_year
+        index.last_year = first_year + len(levels) - 1
+        index._levels = levels
+        return index
+
+    def level(self, year: int) -> float:
+        if not self.first_year <= year <= self.last_year:
+            raise KeyError(year)
+        return self._levels.item(year - self.first_year)
+
+    def window(self, start_year: int, end_year: int) -> np.ndarray:
+        """Read-only view of the levels for every year from ``start_year`` to ``end_year`` inclusive."""
+        if not self.first_year <= start_year <= end_year <= self.last_year:
+            raise KeyError(start_year if start_year < self.first_year else end_year)
+        return self._levels[start_year - self.first_year:end_year - self.first_year + 1]
+
+    def between(self, start_year: int, end_year: int) -> float:
+        """Compound factor taking a value from ``start_year`` to ``end_year`` (either direction)."""
+        if start_year == end_year:
+            return 1.0
+        return self.level(end_year) / self.level(start_year)
+
+_RATE_SERIES = ("growth", "valorization", "inflation")
+_POSITIVE_SERIES = ("average_wage", "life_expectancy")
+_NON_NEGATIVE_SERIES = ("expected_absence_female", "expected_absence_male")
+_PACKED_SERIES = (*_RATE_SERIES, *_POSITIVE_SERIES, *_NON_NEGATIVE_SERIES)
+
+class StatisticsSnapshot:
+    """One immutable, validated version of the statistics tables.
+
+    Everything derived from a statistics file hangs off a snapshot, tagged
+    with the ``version`` hash of the file contents, so code holding a
+    snapshot keeps a consistent view however often the file is replaced.
+    Series equal to one in ``shared`` (keyed by ``_series_key``) reuse its
+    array, so scenarios that only differ in a few series stay compact.
+
+    A snapshot mapped from a shared pack (see ``statistics_pack``) records
+    its path in ``pack``; its tables live in pages shared by every process
+    attached to the same version.
+    """
+    __slots__ = (
+        "scenario", "version", "growth", "average_wage", "valorization", "inflation", "life_expectancy",
+        "life_expectancy_male", "life_expectancy_female", "expected_absence_female", "expected_absence_male",
+        "growth_index", "inflation_index", "meta", "pack",
+    )
+
+    def __init__(self, raw: dict, version: str, scenario: str = DEFAULT_SCENARIO, shared: dict | None = None):
+        def series(d: dict) -> YearSeries:
+            parsed = YearSeries.from_json(d)
+            return parsed if shared is None else shared.setdefault(_series_key(parsed), parsed)
+
+        self.scenario = scenario
+        self.version = version
+        self.growth = series(raw["growth_rate"])
+        self.average_wage = series(raw["average_wage"])
+        self.valorization = series(raw["valorization"])
+        self.inflation = series(raw["inflation"])
+        self.life_expectancy = series(raw["life_expectancy"])
+        # For now, use the same life expectancy data for both genders
+        # In a real application, you'd have separate data for male/female
+        self.life_expectancy_male = self.life_expectancy
+        self.life_expectancy_female = self.life_expectancy
+        # Handle nested structure for average_leave
+        self.expected_absence_female = series(raw["average_leave"]["F"])
+        self.expected_absence_male = series(raw["average_leave"]["M"])
+        self.growth_index = CumulativeIndex(self.growth)
+        self.inflation_index = CumulativeIndex(self.inflation)
+        self.meta = MappingProxyType({"scenario": raw.get("scenario",""), "prepared_on": raw.get("prepared_on","")})
+        self.pack = None
+        self._validate()
+
+    @classmethod
+    def from_pack(cls, path: Path, scenario: str = DEFAULT_SCENARIO) -> "StatisticsSnapshot":
+        header, columns = read_pack(path)
+        snapshot = cls.__new__(cls)
+        snapshot.scenario = scenario
+        snapshot.version = header["version"]
+        for name in _PACKED_SERIES:
+            setattr(snapshot, name, YearSeries(*columns[name]))
+        snapshot.life_expectancy_male = snapshot.life_expectancy
+        snapshot.life_expectancy_female = snapshot.life_expectancy
+        snapshot.growth_index = CumulativeIndex.from_levels(*columns["growth_index"])
+        snapshot.inflation_index = CumulativeIndex.from_levels(*columns["inflation_index"])
+        snapshot.meta = MappingProxyType(header["meta"])
+        snapshot.pack = Path(path)
+        snapshot._validate()
+        return snapshot
+
+    def write_pack(self, directory: Path) -> Path:
+        """Write this snapshot as a pack in ``directory``; returns its path."""
+        columns = {name: (getattr(self, name).first_year, getattr(self, name).values) for name in _PACKED_SERIES}
+        for name in ("growth_index", "inflation_index"):
+            index = getattr(self, name)
+            columns[name] = (index.first_year, index.window(index.first_year, index.last_year))
+        return write_pack(directory, {"version": self.version, "meta": dict(self.meta)}, columns)
+
+    def series(self) -> list[YearSeries]:
+        return [getattr(self, name) for name in _PACKED_SERIES]
+
+    def __reduce__(self):
+        if self.pack is not None:
+            # Workers attach the pack (once per process) instead of receiving a copy of the tables.
+            return _attach_pack, (str(self.pack), self.scenario)
+        # Snapshots travel to worker processes with each task; a mappingproxy does not pickle.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["meta"] = dict(self.meta)
+        return _restore_snapshot, (state,)
+
+    def _validate(self) -> None:
+        for name in _PACKED_SERIES:
+            if not np.isfinite(getattr(self, name).values).all():
+                raise ValueError(f"{name} contains non-finite values")
+        for name in _RATE_SERIES:
+            if (getattr(self, name).values <= -1).any():
+                raise ValueError(f"{name} contains a rate of -100% or below")
+        for name in _POSITIVE_SERIES:
+            if (getattr(self, name).values <= 0).any():
+                raise ValueError(f"{name} must be positive")
+        for name in _NON_NEGATIVE_SERIES:
+            if (getattr(self, name).values < 0).any():
+                raise ValueError(f"{name} must not be negative")
+        # The engine walks growth, wages and valorization in lockstep.
+        aligned = (self.growth, self.average_wage, self.valorization)
+        if max(s.first_year for s in aligned) >= min(s.end_year for s in aligned):
+            raise ValueError("growth_rate, average_wage and valorization do not overlap")
+
+def _series_key(series: YearSeries) -> tuple[int, bytes]:
+    return series.first_year, series.values.tobytes()
+
+def _restore_snapshot(state: dict) -> StatisticsSnapshot:
+    snapshot = StatisticsSnapshot.__new__(StatisticsSnapshot)
+    for name, value in state.items():
+        setattr(snapshot, name, value)
+    snapshot.meta = MappingProxyType(snapshot.meta)
+    return snapshot
+
+@lru_cache(maxsize=16)
+def _attach_pack(path: str, scenario: str) -> StatisticsSnapshot:
+    return StatisticsSnapshot.from_pack(Path(path), scenario)
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+class ScenarioSource:
+    """Files one named scenario is built from.
+
+    ``path`` is a complete statistics file; ``series`` maps top-level keys of
+    it (e.g. ``growth_rate``) to standalone ``{year: value}`` files that
+    replace them, and ``meta`` overrides the scenario description.
+    """
+    __slots__ = ("path", "series", "meta")
+
+    def __init__(self, path: Path, series: dict[str, Path] | None = None, meta: dict | None = None):
+        self.path = Path(path)
+        self.series = {key: Path(file) for key, file in (series or {}).items()}
+        self.meta = meta or {}
+
+    def stamp(self) -> tuple:
+        return tuple(_file_stamp(path) for path in (self.path, *self.series.values()))
+
+    def _read(self) -> tuple[str, bytes, dict[str, bytes]]:
+        """Version and raw bytes of the files.
+
+        The version hashes every file read (and the meta overrides), so a
+        scenario made of one unchanged file keeps the version of that file.
+        """
+        data = self.path.read_bytes()
+        parts = {key: path.read_bytes() for key, path in sorted(self.series.items())}
+        digest = hashlib.sha256(data)
+        for key, part in parts.items():
+            digest.update(key.encode())
+            digest.update(part)
+        if self.meta:
+            digest.update(json.dumps(self.meta, sort_keys=True).encode())
+        return digest.hexdigest()[:16], data, parts
+
+    def _parse(self, version: str, data: bytes, parts: dict[str, bytes], scenario: str, shared: dict | None) -> StatisticsSnapshot:
+        try:
+            raw = json.loads(data)
+            for key, part in parts.items():
+                raw[key] = json.loads(part)
+            raw.update(self.meta)
+            return StatisticsSnapshot(raw, version, scenario, shared)
+        except (KeyError, TypeError, AttributeError, IndexError) as e:
+            raise ValueError(f"malformed statistics file: {e!r}") from e
+
+    def parse(self, scenario: str, shared: dict | None = None) -> StatisticsSnapshot:
+        """Snapshot parsed from the JSON files, ignoring any pack; raises ``ValueError`` when they are unusable."""
+        return self._parse(*self._read(), scenario, shared)
+
+    def load(self, scenario: str, shared: dict | None = None) -> StatisticsSnapshot:
+        """Snapshot of the files; raises ``ValueError`` when they are unusable.
+
+        A pack of the same version (compiled ahead of time or published by
+        another process) is memory-mapped instead of parsing the JSON;
+        otherwise the parsed snapshot is published for the next process.
+        """
+        version, data, parts = self._read()
+        path = find_pack(version)
+        if path is not None:
+            try:
+                # Hashed once, here; workers attaching the pack later only check its header and name.
+                verify_pack(path)
+                snapshot = _attach_pack(str(path), scenario)
+                if snapshot.version == version:
+                    return snapshot
+                print(f"Ignoring statistics pack {path}: built for version {snapshot.version}")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Ignoring unusable statistics pack {path}: {e}")
+                # An earlier attachment of this path maps the bad file; the pack written below replaces it.
+                _attach_pack.cache_clear()
+        snapshot = self._parse(version, data, parts, scenario, shared)
+        directory = shared_dir()
+        if directory is None:
+            return snapshot
+        try:
+            return _attach_pack(str(snapshot.write_pack(directory)), scenario)
+        except OSError as e:
+            print(f"Could not publish statistics pack in {directory}: {e}")
+            return snapshot
+
+def read_manifest(path: Path) -> dict[str, ScenarioSource]:
+    try:
+        entries = json.loads(path.read_bytes())
+        return {
+            name: ScenarioSource(
+                path.parent / entry["file"],
+                {key: path.parent / file for key, file in entry.get("series", {}).items()},
+                entry.get("meta"),
+            )
+            for name, entry in entries.items()
+        }
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"malformed scenario manifest: {e!r}") from e
+
+class UnknownScenario(KeyError):
+    pass
+
+class StatisticsRegistry:
+    """Holds the current ``StatisticsSnapshot`` of every named scenario and swaps in new versions.
+
+    The default scenario comes from ``path``; the optional ``manifest`` adds
+    more. All of them are parsed up front, so ``current(scenario)`` is a
+    dict lookup and requests never wait on a reload: a background thread
+    polls the files (size and mtime first), builds and validates changed
+    scenarios off the request path and replaces the mapping in one step.
+    Requests that already took a snapshot finish on it. A scenario whose
+    files fail validation is logged and keeps its previous snapshot.
+    """
+
+    def __init__(self, path: Path = FILE, manifest: Path | None = SCENARIOS_FILE, default_scenario: str = DEFAULT_SCENARIO):
+        self.path = Path(path)
+        self.manifest = Path(manifest) if manifest is not None else None
+        self.default_scenario = default_scenario
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[StatisticsSnapshot], None]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._snapshots: Mapping[str, StatisticsSnapshot] = MappingProxyType({})
+        self._stamps: dict[str, tuple] = {}
+        self._manifest_stamp: tuple[int, int] | None = None
+        self._manifest_sources: dict[str, ScenarioSource] = {}
+        _, errors, _ = self._refresh(force=True)
+        if default_scenario not in self._snapshots:
+            raise ValueError("; ".join(errors))
+        for error in errors:
+            print(f"Statistics scenario skipped: {error}")
+
+    def current(self, scenario: str | None = None) -> StatisticsSnapshot:
+        try:
+            return self._snapshots[scenario or self.default_scenario]
+        except KeyError:
+            raise UnknownScenario(scenario) from None
+
+    def scenarios(self) -> Mapping[str, StatisticsSnapshot]:
+        return self._snapshots
+
+    def on_swap(self, listener: Callable[[StatisticsSnapshot], None]) -> None:
+        """Call ``listener`` with every snapshot swapped in after this point."""
+        self._listeners.append(listener)
+
+    def sources(self) -> dict[str, ScenarioSource]:
+        """Where every scenario is loaded from, the default one first."""
+        if self.manifest is not None and self.manifest.exists():
+            stamp = _file_stamp(self.manifest)
+            if stamp != self._manifest_stamp:
+                # Remember the stamp first so a broken manifest is reported once, not on every poll.
+                self._manifest_stamp = stamp
+                self._manifest_sources = read_manifest(self.manifest)
+        return self._with_default(self._manifest_sources)
+
+    def _with_default(self, sources: dict[str, ScenarioSource]) -> dict[str, ScenarioSource]:
+        # The default scenario always comes from ``path``, never from the manifest.
+        return {self.default_scenario: ScenarioSource(self.path), **{name: source for name, source in sources.items() if name != self.default_scenario}}
+
+    def _refresh(self, force: bool) -> tuple[bool, list[str], list[StatisticsSnapshot]]:
+        errors = []
+        try:
+            sources = self.sources()
+        except (OSError, ValueError) as e:
+            errors.append(f"{self.manifest}: {e}")
+            sources = self._with_default(self._manifest_sources)
+        snapshots = {name: snapshot for name, snapshot in self._snapshots.items() if name in sources}
+        shared = {_series_key(series): series for snapshot in snapshots.values() for series in snapshot.series()}
+        swapped = []
+        for name, source in sources.items():
+            try:
+                stamp = source.stamp()
+                if stamp == self._stamps.get(name) and not force:
+                    continue
+                self._stamps[name] = stamp
+                snapshot = source.load(name, shared)
+            except (OSError, ValueError) as e:
+                errors.append(f"{name}: {e}")
+                continue
+            if name not in snapshots or snapshots[name].version != snapshot.version:
+                snapshots[name] = snapshot
+                swapped.append(snapshot)
+        changed = bool(swapped) or len(snapshots) != len(self._snapshots)
+        if changed:
+            self._snapshots = MappingProxyType(snapshots)
+        return changed, errors, swapped
+
+    def reload(self, force: bool = False) -> bool:
+        """Load every scenario whose files changed; returns whether the set of snapshots changed.
+
+        Valid scenarios are swapped in even when others fail; the failures
+        are then raised as one ``ValueError``.
+        """
+        with self._lock:
+            changed, errors, swapped = self._refresh(force)
+        for snapshot in swapped:
+            for listener in self._listeners:
+                listener(snapshot)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return changed
+
+    def start_polling(self, interval: float = POLL_SECONDS) -> None:
+        if self._thread is not None or interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, args=(interval,), name="statistics-reload", daemon=True)
+        self._thread.start()
+
+    def stop_polling(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _poll(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                if self.reload():
+                    versions = ", ".join(f"{name}={snapshot.version}" for name, snapshot in self._snapshots.items())
+                    print(f"Statistics reloaded: {versions}")
+            except (OSError, ValueError) as e:
+                print(f"Statistics reload failed, keeping the previous snapshots: {e}")
+
+registry = StatisticsRegistry()
+
+def current(scenario: str | None = None) -> StatisticsSnapshot:
+    """The statistics snapshot new work should use; hold on to it for the whole computation.
+
+    Raises ``UnknownScenario`` for a scenario name that is not loaded.
+    """
+    return registry.current(scenario)
+
+# Module-level names from before the registry; each access reads the current snapshot.
+_SNAPSHOT_ATTRIBUTES = {
+    "VERSION": "version",
+    "GROWTH": "growth",
+    "AVERAGE_WAGE": "average_wage",
+    "VALORIZATION": "valorization",
+    "INFLATION": "inflation",
+    "LIFE_EXPECTANCY": "life_expectancy",
+    "LIFE_EXPECTANCY_MALE": "life_expectancy_male",
+    "LIFE_EXPECTANCY_FEMALE": "life_expectancy_female",
+    "EXPECTED_ABSENCE_FEMALE": "expected_absence_female",
+    "EXPECTED_ABSENCE_MALE": "expected_absence_male",
+    "GROWTH_INDEX": "growth_index",
+    "INFLATION_INDEX": "inflation_index",
+    "META": "meta",
+}
+
+def __getattr__(name: str):
+    if name in _SNAPSHOT_ATTRIBUTES:
+        return getattr(registry.current(), _SNAPSHOT_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,15 @@
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Optional, List, Sequence, Tuple
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from datetime import datetime
 from enum import Enum
 from uuid import UUID
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum as SAEnum, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Enum as SAEnum, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import uuid
 
+import numpy as np
+
 class Sex(str, Enum):
     MALE = "M"
     FEMALE = "F"
@@ -21,7 +23,19 @@ class CalculationRequest(BaseModel):
     year_desired_retirement: int
     postal_code: Optional[str] = None
     jobs: List["Job"]
-    leaves: List["Leave"]
+    # A tuple of frozen leaves, so the index below can only go stale by replacing it.
+    leaves: Tuple["Leave", ...]
+    include_expected_absence: bool = True
+
+    _leave_index: tuple | None = PrivateAttr(default=None)
+
+    @property
+    def leave_index(self) -> "LeaveIndex":
+        """Leaves bucketed by year and type, rebuilt whenever ``leaves`` is replaced (copies included)."""
+        cached = self._leave_index
+        if cached is None or cached[0] is not self.leaves:
+            cached = self._leave_index = (self.leaves, LeaveIndex(self.leaves))
+        return cached[1]
 
 class Calculation(CalculationRequest):
     calculation_datetime: datetime
@@ -43,17 +57,55 @@ class LeaveType(Enum):
     ACCIDENT = "ACCIDENT"
     UNPAID = "UNPAID"
 
+LEAVE_MULTIPLIERS = {
+    LeaveType.MATERNITY: 0.098,
+    LeaveType.PATERNITY: 0.098,
+    LeaveType.SICKNESS: 0.098,
+    LeaveType.DEFAULT: 0.196,
+    LeaveType.ACCIDENT: 0.098,
+    LeaveType.UNPAID: 0.098,
+}
+
 class Leave(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     duration_days: int
     leave_year: int
     leave_type: LeaveType
     def get_multiplier(self) -> float:
-        if self.leave_type in [LeaveType.MATERNITY, LeaveType.PATERNITY, LeaveType.ACCIDENT]:
-            return 0.098
-        elif self.leave_type in [LeaveType.DEFAULT]:
-            return 0.196
-        else:
-            return 0.098
+        return LEAVE_MULTIPLIERS[self.leave_type]
+
+_LEAVE_COLUMNS = {leave_type: column for column, leave_type in enumerate(LeaveType)}
+LEAVE_MULTIPLIER_COLUMN = np.array([LEAVE_MULTIPLIERS[leave_type] for leave_type in LeaveType])
+
+class LeaveIndex:
+    """Leave days of one calculation bucketed by year, one column per LeaveType.
+
+    ``years`` is the sorted array of years that have any leave and ``days``
+    the matching (year x LeaveType) matrix of leave days.
+    """
+    __slots__ = ("years", "days")
+
+    def __init__(self, leaves: Sequence[Leave]):
+        if not leaves:
+            self.years = np.empty(0, dtype=np.int64)
+            self.days = np.empty((0, len(_LEAVE_COLUMNS)))
+            return
+        rows = np.array([(leave.leave_year, _LEAVE_COLUMNS[leave.leave_type], leave.duration_days) for leave in leaves], dtype=np.int64)
+        self.years, year_rows = np.unique(rows[:, 0], return_inverse=True)
+        self.days = np.zeros((len(self.years), len(_LEAVE_COLUMNS)))
+        np.add.at(self.days, (year_rows, rows[:, 1]), rows[:, 2])
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def leave_days(self) -> np.ndarray:
+        """Total leave days in each of ``years``."""
+        return self.days.sum(axis=1)
+
+    def weighted_leave_days(self) -> np.ndarray:
+        """Leave days in each of ``years`` weighted by their contribution multiplier."""
+        return self.days @ LEAVE_MULTIPLIER_COLUMN
 
 
 class Job(BaseModel):
@@ -65,6 +117,8 @@ Base = declarative_base()
 
 class DbCalculation(Base):
     __tablename__ = "calculations"
+    # Keyset pagination walks calculations in (calculation_datetime, calculation_id) order.
+    __table_args__ = (Index("ix_calculations_datetime_id", "calculation_datetime", "calculation_id"),)
 
     # Use a string column for portability. If using Postgres, prefer UUID type (see below).
     calculation_id = Column(String(36), primary_key=True)            # str(uuid4())
@@ -79,6 +133,39 @@ class DbCalculation(Base):
     year_desired_retirement = Column(Integer, nullable=False)
     postal_code = Column(String(16), nullable=True)
 
-    # Store jobs/leaves as JSON blobs (since you model them in Pydantic)
-    jobs = Column(JSON, nullable=False)
-    leaves = Column(JSON, nullable=False, default=[])
+    jobs = relationship("DbJob", order_by="DbJob.position", cascade="all, delete-orphan", passive_deletes=True)
+    leaves = relationship("DbLeave", order_by="DbLeave.position", cascade="all, delete-orphan", passive_deletes=True)
+
+class DbJob(Base):
+    __tablename__ = "calculation_jobs"
+    __table_args__ = (
+        # "Jobs active in year y": (end_year is null or end_year >= y) and start_year <= y,
+        # answered from the index alone, calculation ids included.
+        Index("ix_calculation_jobs_years", "end_year", "start_year", "calculation_id"),
+        # Covers salary aggregates grouped by start year without touching the table.
+        Index("ix_calculation_jobs_start_year_salary", "start_year", "base_salary"),
+        Index("ix_calculation_jobs_base_salary", "base_salary"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    calculation_id = Column(String(36), ForeignKey("calculations.calculation_id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)                       # order within the request
+
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)                           # None: still employed
+    start_year = Column(Integer, nullable=False)
+    end_year = Column(Integer, nullable=True)
+    base_salary = Column(Float, nullable=False)
+
+class DbLeave(Base):
+    __tablename__ = "calculation_leaves"
+    __table_args__ = (Index("ix_calculation_leaves_years", "end_year", "start_year", "calculation_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    calculation_id = Column(String(36), ForeignKey("calculations.calculation_id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)                           # None: a single day
+    start_year = Column(Integer, nullable=False)
+    end_year = Column(Integer, nullable=False)
@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Literal, NamedTuple
+
+from sqlalchemy import Select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DbCalculation
+
+# Listing order: newest first, ties broken by id so every row has one fixed position.
+SORT_KEY = (DbCalculation.calculation_datetime, DbCalculation.calculation_id)
+
+class Cursor(NamedTuple):
+    """Position between two pages: the sort key of the boundary row and which way to read from it."""
+    calculation_datetime: datetime
+    calculation_id: str
+    direction: Literal["next", "prev"]
+
+    def encode(self) -> str:
+        payload = json.dumps([self.calculation_datetime.isoformat(), self.calculation_id, self.direction], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """Raises ``ValueError`` for a token this module did not produce."""
+        try:
+            moment, calculation_id, direction = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            cursor = cls(datetime.fromisoformat(moment), str(calculation_id), direction)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError("invalid cursor") from e
+        if direction not in ("next", "prev"):
+            raise ValueError("invalid cursor")
+        return cursor
+
+    @classmethod
+    def at(cls, calc: DbCalculation, direction: Literal["next", "prev"]) -> "Cursor":
+        return cls(calc.calculation_datetime, calc.calculation_id, direction)
+
+class KeysetPage(NamedTuple):
+    rows: list[DbCalculation]
+    next_cursor: str | None
+    prev_cursor: str | None
+
+async def keyset_page(db: AsyncSession, query: Select, limit: int, cursor: Cursor | None = None) -> KeysetPage:
+    """One page of ``query`` in ``SORT_KEY`` order (descending), seeking past ``cursor``.
+
+    Reads at most ``limit + 1`` rows through the ``(calculation_datetime,
+    calculation_id)`` index, so a page costs the same however deep it is;
+    the extra row only tells whether another page follows.
+    """
+    key = tuple_(*SORT_KEY)
+    if cursor is None or cursor.direction == "next":
+        if cursor is not None:
+            query = query.where(key < tuple_(cursor.calculation_datetime, cursor.calculation_id))
+        rows = list(await db.scalars(query.order_by(*(column.desc() for column in SORT_KEY)).limit(limit + 1)))
+        more, rows = len(rows) > limit, rows[:limit]
+        return KeysetPage(
+            rows,
+            Cursor.at(rows[-1], "next").encode() if more else None,
+            Cursor.at(rows[0], "prev").encode() if cursor is not None and rows else None,
+        )
+    # Walking backwards: read the preceding rows in ascending order, then restore the listing order.
+    query = query.where(key > tuple_(cursor.calculation_datetime, cursor.calculation_id))
+    rows = list(await db.scalars(query.order_by(*(column.asc() for column in SORT_KEY)).limit(limit + 1)))
+    more, rows = len(rows) > limit, rows[:limit][::-1]
+    return KeysetPage(
+        rows,
+        Cursor.at(rows[-1], "next").encode() if rows else None,
+        Cursor.at(rows[0], "prev").encode() if more else None,
+    )
+
+async def approximate_count(db: AsyncSession) -> int | None:
+    """Cheap estimate of the number of calculations, or None when the backend offers none.
+
+    SQLite reads the largest rowid (exact unless rows were deleted),
+    PostgreSQL the planner's row estimate; neither scans the table.
+    """
+    dialect = db.get_bind().dialect.name
+    table = DbCalculation.__tablename__
+    if dialect == "sqlite":
+        return await db.scalar(text(f"SELECT coalesce(max(rowid), 0) FROM {table}"))
+    if dialect == "postgresql":
+        estimate = await db.scalar(text("SELECT reltuples FROM pg_class WHERE relname = :table"), {"table": table})
+        return max(int(estimate), 0) if estimate is not None else None
+    return None
@@ -0,0 +1,111 @@
+from concurrent.futures import Executor
+from datetime import datetime
+
+import numpy as np
+
+from .algorithm import AVG_SALARIES_PER_YEAR_THRESHOLD, CareerBatch
+from .mapper import StatisticsSnapshot, current
+from .models import Calculation
+
+PERCENTILES = (5, 50, 95)
+
+# Yearly shocks around the deterministic scenario: standard deviations of
+# (growth, inflation, valorization), their correlation, and AR(1) persistence
+# so that a bad year tends to be followed by another one.
+SHOCK_VOLATILITY = np.array([0.02, 0.015, 0.02])
+SHOCK_CORRELATION = np.array([
+    [1.0, 0.5, 0.9],
+    [0.5, 1.0, 0.5],
+    [0.9, 0.5, 1.0],
+])
+SHOCK_PERSISTENCE = 0.6
+MIN_RATE = -0.5
+
+def sample_paths(years: np.ndarray, first_random_year: int, paths: int, rng: np.random.Generator, statistics: StatisticsSnapshot | None = None) -> np.ndarray:
+    """Sample ``(paths, 3, len(years))`` rates of (growth, inflation, valorization).
+
+    Years before ``first_random_year`` keep their historical values.
+    """
+    statistics = statistics or current()
+    series = (statistics.growth, statistics.inflation, statistics.valorization)
+    baseline = np.stack([rates.window(int(years[0]), int(years[-1]) + 1) for rates in series])
+    rates = np.broadcast_to(baseline, (paths, *baseline.shape)).copy()
+    random_years = np.flatnonzero(years >= first_random_year)
+    if random_years.size == 0:
+        return rates
+    # Stationary AR(1): scale innovations so the marginal volatility stays SHOCK_VOLATILITY.
+    scale = SHOCK_VOLATILITY * np.sqrt(1 - SHOCK_PERSISTENCE ** 2)
+    shocks = rng.standard_normal((random_years.size, paths, 3)) @ np.linalg.cholesky(SHOCK_CORRELATION).T * scale
+    state = np.zeros((paths, 3))
+    for step, column in enumerate(random_years):
+        state = SHOCK_PERSISTENCE * state + shocks[step]
+        rates[:, :, column] += state
+    np.maximum(rates, MIN_RATE, out=rates)
+    return rates
+
+def _simulate_shard(calc: Calculation, paths: int, seed: np.random.SeedSequence, now: int, statistics: StatisticsSnapshot) -> np.ndarray:
+    """Nominal and real monthly pension for ``paths`` sampled scenarios, shape ``(paths, 2)``."""
+    batch = CareerBatch([calc], now=now, statistics=statistics)
+    retirement_year = calc.year_desired_retirement
+    first_year = min(batch.start_year, now)
+    # Inflation is needed up to the retirement year (or now), which can lie past the last contribution.
+    years = np.arange(first_year, max(batch.end_year, retirement_year, now))
+    rates = sample_paths(years, now, paths, np.random.default_rng(seed), statistics)
+    growth_rates, inflation_rates, valorization_rates = rates[:, 0], rates[:, 1], rates[:, 2]
+
+    grid = slice(batch.start_year - first_year, batch.end_year - first_year)
+    growth = np.ones((paths, batch.end_year - batch.start_year))
+    np.cumprod(1 + growth_rates[:, grid][:, :-1], axis=1, out=growth[:, 1:])
+    growth_index = statistics.growth_index
+    baseline_growth = growth_index.window(batch.start_year, batch.end_year - 1) / growth_index.level(batch.start_year)
+    # Average wage (and so the contribution cap) follows the sampled growth path.
+    contribution_cap = AVG_SALARIES_PER_YEAR_THRESHOLD * statistics.average_wage.window(batch.start_year, batch.end_year) * growth / baseline_growth
+    funds = batch.funds(growth, contribution_cap, 1 + valorization_rates[:, grid])[:, 0]
+
+    last = int(np.flatnonzero(batch.active[0])[-1])
+    nominal = funds[:, last] / statistics.life_expectancy[batch.retirement_ages[0]]
+    # Real value in current-year money, as main._pension_response does with
+    # algorithm.get_real_value: deflate over [now, retirement year) along
+    # each path's own inflation.
+    if retirement_year >= now:
+        deflator = np.prod(1 + inflation_rates[:, now - first_year:retirement_year - first_year], axis=1)
+    else:
+        deflator = 1 / np.prod(1 + inflation_rates[:, retirement_year - first_year:now - first_year], axis=1)
+    return np.column_stack((nominal, nominal / deflator))
+
+def simulate_monthly_pension(
+    calc: Calculation,
+    paths: int = 10_000,
+    seed: int | None = None,
+    shard_size: int = 2_000,
+    executor: Executor | None = None,
+    statistics: StatisticsSnapshot | None = None,
+) -> dict | None:
+    """Percentile bands of the monthly pension over sampled macro scenarios.
+
+    Paths are split into shards of at most ``shard_size`` (bounding memory)
+    with independent child seeds, so results only depend on ``seed``, never on
+    how shards are scheduled. Pass a process pool as ``executor`` to spread
+    shards across cores; every shard gets the same statistics snapshot
+    (``statistics``, the current one unless given). Returns None when the
+    career is not eligible.
+    """
+    now = datetime.now().year
+    statistics = statistics or current()
+    batch = CareerBatch([calc], now=now, statistics=statistics)
+    if not batch.members or batch.retirement_ages[0] not in statistics.life_expectancy:
+        return None
+    shards = [min(shard_size, paths - start) for start in range(0, paths, shard_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+    if executor is None:
+        results = [_simulate_shard(calc, size, shard_seed, now, statistics) for size, shard_seed in zip(shards, seeds)]
+    else:
+        futures = [executor.submit(_simulate_shard, calc, size, shard_seed, now, statistics) for size, shard_seed in zip(shards, seeds)]
+        results = [future.result() for future in futures]
+    samples = np.concatenate(results)
+    bands = np.percentile(samples, PERCENTILES, axis=0)
+    return {
+        "paths": paths,
+        "nominal": {f"p{p}": float(value) for p, value in zip(PERCENTILES, bands[:, 0])},
+        "real": {f"p{p}": float(value) for p, value in zip(PERCENTILES, bands[:, 1])},
+    }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 
 # -------------------------- Basic Data Models --------------------------
@@ -24,13 +24,18 @@ class LifeExpectancyData(BaseModel):
     female: List[StatisticsDataResponse]
 
 class StatisticsResponse(BaseModel):
-    growth_rate: List[StatisticsDataResponse]
-    average_wage: List[StatisticsDataResponse]
-    valorization: List[StatisticsDataResponse]
-    inflation: List[StatisticsDataResponse]
-    life_expectancy: LifeExpectancyData
+    # Series left out with ?series= are omitted from the response.
+    growth_rate: Optional[List[StatisticsDataResponse]] = None
+    average_wage: Optional[List[StatisticsDataResponse]] = None
+    valorization: Optional[List[StatisticsDataResponse]] = None
+    inflation: Optional[List[StatisticsDataResponse]] = None
+    life_expectancy: Optional[LifeExpectancyData] = None
     meta: Optional[Dict[str, str]] = None
 
+class StatisticsColumnsResponse(BaseModel):
+    years: List[int]
+    values: Dict[str, List[Optional[float]]]
+
 # -------------------------- API Response Schemas for GET requests --------------------------
 
 class HealthCheckResponse(BaseModel):
@@ -38,6 +43,21 @@ class HealthCheckResponse(BaseModel):
     timestamp: datetime
     version: str = "1.0.0"
 
+class CacheStatsResponse(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    shared_hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+class StatisticsVersionResponse(BaseModel):
+    scenario: str
+    version: str
+    meta: Optional[Dict[str, Any]] = None
+
 class ErrorResponse(BaseModel):
     error: str
     detail: Optional[str] = None
@@ -86,6 +106,17 @@ class CalculationResponse(BaseModel):
     replacementRate: Optional[float] = None
     averageWage: Optional[float] = None
 
+class CalculationBatchResponse(BaseModel):
+    inserted: int
+    # One per submitted calculation, in submission order.
+    results: List[CalculationResponse]
+
+class GoalSolutionResponse(BaseModel):
+    expectedPension: str
+    salaryMultiplier: Optional[float] = None
+    requiredSalary: Optional[str] = None
+    earliestRetirementYear: Optional[int] = None
+
 # -------------------------- Admin Schemas --------------------------
 
 class CalculationDetail(BaseModel):
@@ -122,10 +153,23 @@ class CalculationAdminDetail(BaseModel):
 
 class PaginatedCalculationsResponse(BaseModel):
     submissions: List[CalculationAdminDetail]
-    page: int
     pageSize: int
-    totalItems: int
-    totalPages: int
+    nextCursor: Optional[str] = None
+    prevCursor: Optional[str] = None
+    # Only for the deprecated ``page`` parameter.
+    page: Optional[int] = None
+    # Present when requested through ``total``; approximate unless ``total=exact``.
+    totalItems: Optional[int] = None
+    totalPages: Optional[int] = None
+
+class ActiveJobsResponse(BaseModel):
+    year: int
+    calculations: int
+
+class SalaryByStartYearResponse(BaseModel):
+    startYear: int
+    jobs: int
+    averageBaseSalary: float
 
 # -------------------------- Analysis Schemas --------------------------
 
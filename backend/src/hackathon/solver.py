@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+
+from .algorithm import CareerBatch, RetirementCheckpoints, horizon_year
+from .mapper import StatisticsSnapshot, current
+from .models import Calculation
+
+# Monthly pensions only grow with salary, so that search narrows a bracket
+# instead of scanning. Retirement years are scanned: a negative valorization
+# year can lower the pension of a later retirement.
+MAX_SALARY_MULTIPLIER = 1000.0
+SALARY_SEARCH_POINTS = 32
+SALARY_TOLERANCE = 1e-4
+
+def check_years(calc: Calculation, statistics: StatisticsSnapshot, retirement: bool = True) -> None:
+    """Raise ValueError when the career (and, with ``retirement``, the desired
+    retirement year) reaches outside the years ``statistics`` covers."""
+    first_year = max(statistics.growth_index.first_year, statistics.inflation_index.first_year,
+                     statistics.average_wage.first_year, statistics.valorization.first_year)
+    last_year = horizon_year(statistics)
+    for job in calc.jobs:
+        if job.start_date < first_year:
+            raise ValueError(f"job starting in {job.start_date} is before {first_year}, the first year of the statistics tables")
+    if retirement and calc.year_desired_retirement > last_year:
+        raise ValueError(f"retirement in {calc.year_desired_retirement} is past {last_year}, the end of the statistics tables")
+
+def solve_salary_multiplier(calc: Calculation, target: float, measure: str = "nominal", statistics: StatisticsSnapshot | None = None) -> float | None:
+    """Smallest factor on every job's salary whose monthly pension reaches ``target``.
+
+    Each round evaluates ``SALARY_SEARCH_POINTS`` multipliers in one engine
+    call and keeps the sub-interval where the target is crossed. Returns None
+    when the career is not eligible or the target stays out of reach (the
+    contribution cap bounds the pension).
+    """
+    statistics = statistics or current()
+    check_years(calc, statistics)
+    batch = CareerBatch([calc], statistics=statistics)
+    life_expectancy = batch.statistics.life_expectancy
+    if not batch.members or batch.retirement_ages[0] not in life_expectancy:
+        return None
+    divisor = life_expectancy[batch.retirement_ages[0]]
+    if measure == "real":
+        divisor *= float(batch._deflators[0, 0])
+
+    def pensions(multipliers: np.ndarray) -> np.ndarray:
+        return batch.final_funds(batch.evaluate(multipliers))[:, 0] / divisor
+
+    low, high = pensions(np.array([0.0, MAX_SALARY_MULTIPLIER]))
+    if low >= target:
+        return 0.0
+    if high < target:
+        return None
+    low, high = 0.0, MAX_SALARY_MULTIPLIER
+    while high - low > SALARY_TOLERANCE * high:
+        grid = np.linspace(low, high, SALARY_SEARCH_POINTS)
+        crossing = int(np.searchsorted(pensions(grid), target))
+        low, high = grid[crossing - 1], grid[crossing]
+    return float(high)
+
+def solve_retirement_year(calc: Calculation, target: float, measure: str = "nominal", statistics: StatisticsSnapshot | None = None) -> int | None:
+    """Earliest retirement year, from the current one on, whose monthly pension reaches ``target``."""
+    calc_year = calc.calculation_datetime.year
+    first_year = max(datetime.now().year, calc_year)
+    statistics = statistics or current()
+    # The desired retirement year is what this search replaces; only the jobs must fit.
+    check_years(calc, statistics, retirement=False)
+    # Past the last age with a life expectancy there is no pension to compare.
+    last_year = min(horizon_year(statistics), calc_year + max(statistics.life_expectancy) - calc.age)
+    if last_year < first_year:
+        return None
+    checkpoints = RetirementCheckpoints(calc, horizon=last_year, statistics=statistics)
+    pensions = checkpoints.pensions(range(first_year, last_year + 1))
+    return next((year for year, pension in pensions.items() if pension is not None and pension[measure] >= target), None)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import stat
+import struct
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Packs built ahead of time by ``hackathon-compile-statistics``; looked up first.
+COMPILED_DIR = os.getenv("STATISTICS_COMPILED_DIR", str(Path(__file__).resolve().parents[2] / "compiled_statistics"))
+# Directory where statistics snapshots are published for other worker processes; empty disables it.
+# Packs found there change every pension computed, so it is used only while it is private to this user.
+_USER_SUFFIX = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+SHARED_DIR = os.getenv("STATISTICS_SHARED_DIR", str(Path(tempfile.gettempdir()) / f"hackathon-statistics{_USER_SUFFIX}"))
+
+MAGIC = b"HSTATS\x00\x01"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+
+def shared_dir() -> Path | None:
+    """``SHARED_DIR``, created with mode 0700 if missing.
+
+    None when sharing is disabled, or when the directory is not a real
+    directory owned by this user and writable by nobody else: another local
+    user could otherwise plant packs in it.
+    """
+    if not SHARED_DIR:
+        return None
+    directory = Path(SHARED_DIR)
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = directory.lstat()
+    except OSError as e:
+        print(f"Not sharing statistics packs through {directory}: {e}")
+        return None
+    foreign = hasattr(os, "getuid") and info.st_uid != os.getuid()
+    if not stat.S_ISDIR(info.st_mode) or foreign or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        print(f"Not sharing statistics packs through {directory}: it must be a directory owned by this user and writable only by it")
+        return None
+    return directory
+
+def pack_name(version: str, checksum: str) -> str:
+    """File name of a pack: the statistics version, then the first 16 hex digits of its body's SHA-256."""
+    return f"{version}.{checksum[:16]}.stats"
+
+def find_pack(version: str, directory: str | Path | None = None) -> Path | None:
+    """An existing pack of ``version`` in ``directory``; by default compiled packs first, then ``shared_dir()``.
+
+    Packs are named after the version, which hashes the source files, so a
+    pack built from older sources is never picked up.
+    """
+    for candidate in ((COMPILED_DIR, shared_dir()) if directory is None else (directory,)):
+        if candidate:
+            for path in sorted(Path(candidate).glob(pack_name(version, "*"))):
+                return path
+    return None
+
+def write_pack(directory: Path, header: dict, columns: dict[str, tuple[int, np.ndarray]]) -> Path:
+    """Write ``columns`` (name -> first year, float64 values) as a pack in ``directory``; returns its path.
+
+    Layout: ``MAGIC``, a little-endian uint32 header length, the JSON header
+    (``header`` plus each column's first year, offset and length, and the
+    SHA-256 of the body), zero padding to 8 bytes, then the float64 columns
+    back to back. ``header`` must name the ``version``; the file is named by
+    ``pack_name``. It is written under a temporary name and renamed, so
+    readers never see a partial pack.
+    """
+    layout, offset, body = {}, 0, []
+    for name, (first_year, values) in columns.items():
+        layout[name] = {"first_year": first_year, "offset": offset, "length": len(values)}
+        offset += len(values) * 8
+        body.append(np.ascontiguousarray(values, dtype="<f8").tobytes())
+    checksum = hashlib.sha256(b"".join(body)).hexdigest()
+    encoded = json.dumps({**header, "columns": layout, "sha256": checksum}, separators=(",", ":")).encode()
+    prefix = len(MAGIC) + _HEADER_LENGTH.size + len(encoded)
+    padding = b"\x00" * (-prefix % _ALIGNMENT)
+
+    path = Path(directory) / pack_name(header["version"], checksum)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _HEADER_LENGTH.pack(len(encoded)) + encoded + padding)
+        for column in body:
+            f.write(column)
+    os.replace(tmp, path)
+    return path
+
+def _map(path: Path) -> tuple[np.ndarray, dict, int]:
+    """The mapped file, its header and the offset of its body; raises ``ValueError`` for a malformed pack.
+
+    The header must agree with the file name, and the columns must fill
+    the body exactly, which also catches a truncated file.
+    """
+    # Plain ndarray views keep the mapping alive without memmap's per-operation overhead.
+    data = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a statistics pack")
+    start = len(MAGIC) + _HEADER_LENGTH.size
+    (length,) = _HEADER_LENGTH.unpack(bytes(data[len(MAGIC):start]))
+    header = json.loads(bytes(data[start:start + length]))
+    body = start + length + (-(start + length) % _ALIGNMENT)
+    if "sha256" not in header or path.name != pack_name(header.get("version"), header["sha256"]):
+        raise ValueError(f"{path} does not match the version and checksum in its name")
+    if body + sum(column["length"] * 8 for column in header["columns"].values()) != len(data):
+        raise ValueError(f"{path} is truncated")
+    return data, header, body
+
+def verify_pack(path: Path) -> None:
+    """Hash the body of the pack at ``path``; raises ``ValueError`` when it does not match its checksum.
+
+    Done once, by the process that publishes a pack it did not write; see
+    ``read_pack``.
+    """
+    data, header, body = _map(path)
+    if hashlib.sha256(data[body:]).hexdigest() != header["sha256"]:
+        raise ValueError(f"{path} does not match its checksum")
+
+def read_pack(path: Path) -> tuple[dict, dict[str, tuple[int, np.ndarray]]]:
+    """Memory-map the pack at ``path``; columns are read-only views of the mapping.
+
+    Every process attaching the same file shares its pages, so a worker
+    neither parses the tables nor keeps a private copy of them. Only the
+    header, the file name and the size are checked, which leaves the body's
+    pages untouched until they are used; ``verify_pack`` hashes the body.
+    Raises ``ValueError`` when the file is not a complete pack.
+    """
+    data, header, body = _map(path)
+    del header["sha256"]
+    columns = {}
+    for name, column in header.pop("columns").items():
+        first, last = body + column["offset"], body + column["offset"] + column["length"] * 8
+        if last > len(data):
+            raise ValueError(f"{path} is truncated")
+        columns[name] = (column["first_year"], data[first:last].view("<f8"))
+    return header, columns
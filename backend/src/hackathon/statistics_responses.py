@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from .mapper import StatisticsSnapshot, YearSeries, registry
+from .schemas import LifeExpectancyData, LifeExpectancyResponse, StatisticsColumnsResponse, StatisticsDataResponse, StatisticsResponse
+
+# Rendered bodies kept across snapshot versions and scenarios; a handful per version.
+RESPONSE_CACHE_SIZE = int(os.getenv("STATISTICS_RESPONSE_CACHE_SIZE", "256"))
+
+class StatisticsQuery(NamedTuple):
+    """Window, series selection and layout of a statistics response.
+
+    ``start`` and ``end`` are inclusive; ``step`` keeps every n-th year
+    counted from ``start`` (or the first year of the selected series), so
+    all series share one grid. ``series`` only applies to ``/statistics``.
+    """
+    start: int | None = None
+    end: int | None = None
+    step: int = 1
+    series: tuple[str, ...] | None = None
+    columnar: bool = False
+
+    @property
+    def filtered(self) -> bool:
+        return (self.start, self.end, self.step, self.series) != (None, None, 1, None)
+
+# Series of ``/statistics`` keyed by year, by response name.
+YEARLY_SERIES = {
+    "growth_rate": "growth",
+    "average_wage": "average_wage",
+    "valorization": "valorization",
+    "inflation": "inflation",
+}
+# Keyed by age, so never on the yearly grid.
+LIFE_EXPECTANCY = "life_expectancy"
+SERIES_NAMES = (*YEARLY_SERIES, LIFE_EXPECTANCY)
+
+def _grid(series: list[YearSeries], query: StatisticsQuery) -> range:
+    """Years of the response: the query window clipped to the series, every ``step``-th from its start."""
+    covered_first = min(s.first_year for s in series)
+    covered_last = max(s.end_year for s in series) - 1
+    first = covered_first if query.start is None else query.start
+    last = covered_last if query.end is None else min(query.end, covered_last)
+    if first < covered_first:
+        # Stay on the grid anchored at ``start`` while skipping years no series covers.
+        first -= (first - covered_first) // query.step * query.step
+    return range(first, last + 1, query.step)
+
+def _series(series: YearSeries, years: range | None = None) -> list[StatisticsDataResponse]:
+    if years is None:
+        return [StatisticsDataResponse(year=year, value=value) for year, value in series.items()]
+    return [StatisticsDataResponse(year=year, value=series[year]) for year in years if year in series]
+
+def _life_expectancy(series: YearSeries, gender: str, years: range | None = None) -> list[LifeExpectancyResponse]:
+    return [LifeExpectancyResponse(year=row.year, value=row.value, gender=gender) for row in _series(series, years)]
+
+def _columns(named: dict[str, YearSeries], query: StatisticsQuery) -> StatisticsColumnsResponse:
+    years = _grid(list(named.values()), query)
+    return StatisticsColumnsResponse(
+        years=list(years),
+        values={name: [series.get(year) for year in years] for name, series in named.items()},
+    )
+
+def _all_statistics(statistics: StatisticsSnapshot, query: StatisticsQuery) -> StatisticsResponse | StatisticsColumnsResponse:
+    selected = query.series or (tuple(YEARLY_SERIES) if query.columnar else SERIES_NAMES)
+    yearly = {name: getattr(statistics, YEARLY_SERIES[name]) for name in selected if name in YEARLY_SERIES}
+    if query.columnar:
+        if LIFE_EXPECTANCY in selected:
+            raise ValueError("life_expectancy is keyed by age; fetch it from /statistics/life-expectancy")
+        return _columns(yearly, query)
+    fields: dict[str, Any] = {"meta": dict(statistics.meta) if any(statistics.meta.values()) else None}
+    if yearly:
+        years = _grid(list(yearly.values()), query) if query.filtered else None
+        fields.update({name: _series(series, years) for name, series in yearly.items()})
+    if LIFE_EXPECTANCY in selected:
+        male, female = statistics.life_expectancy_male, statistics.life_expectancy_female
+        years = _grid([male, female], query) if query.filtered else None
+        fields[LIFE_EXPECTANCY] = LifeExpectancyData(male=_series(male, years), female=_series(female, years))
+    return StatisticsResponse(**fields)
+
+def _single(attribute: str, name: str):
+    def render(statistics: StatisticsSnapshot, query: StatisticsQuery):
+        series = getattr(statistics, attribute)
+        if query.columnar:
+            return _columns({name: series}, query)
+        return _series(series, _grid([series], query) if query.filtered else None)
+    return render
+
+def _single_life_expectancy(attribute: str, gender: str):
+    def render(statistics: StatisticsSnapshot, query: StatisticsQuery):
+        series = getattr(statistics, attribute)
+        if query.columnar:
+            return _columns({LIFE_EXPECTANCY: series}, query)
+        return _life_expectancy(series, gender, _grid([series], query) if query.filtered else None)
+    return render
+
+# Body of every statistics route, by route name.
+ROUTES: dict[str, Callable[[StatisticsSnapshot, StatisticsQuery], Any]] = {
+    "statistics": _all_statistics,
+    "growth-rate": _single("growth", "growth_rate"),
+    "average-wage": _single("average_wage", "average_wage"),
+    "valorization": _single("valorization", "valorization"),
+    "inflation": _single("inflation", "inflation"),
+    "life-expectancy/male": _single_life_expectancy("life_expectancy_male", "Male"),
+    "life-expectancy/female": _single_life_expectancy("life_expectancy_female", "Female"),
+}
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() not in ("gzip", "*"):
+            continue
+        params = params.strip()
+        if not params.startswith("q="):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+class RenderedResponse:
+    """JSON body of one statistics route for one snapshot, with a gzip variant and strong ETags.
+
+    The body is serialized exactly as FastAPI would serialize the models,
+    once; serving it is a header check and a bytes write.
+    """
+    __slots__ = ("body", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, content: Any):
+        # Fields a filtered response leaves out are unset rather than null.
+        self.body = json.dumps(jsonable_encoder(content, exclude_unset=True), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+        # mtime=0 keeps the compressed bytes, and so their ETag, stable across processes.
+        self.gzipped = gzip.compress(self.body, mtime=0)
+        digest = hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def respond(self, request: Request) -> Response:
+        use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.gzip_etag if use_gzip else self.etag,
+            # Statistics can be reloaded at any time, so clients revalidate instead of trusting an age.
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzipped, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    """Rendered statistics responses keyed by snapshot version, route and query, LRU-bounded."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, RenderedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, statistics: StatisticsSnapshot, route: str, query: StatisticsQuery = StatisticsQuery()) -> RenderedResponse:
+        """Rendered body; raises ``ValueError`` for a query the route cannot answer."""
+        if query.series is not None and route != "statistics":
+            # Checked before the lookup, so an ignored selection cannot add cache entries.
+            raise ValueError("'series' only applies to /statistics")
+        key = (statistics.version, route, query)
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+                return rendered
+        # Rendering twice on a race is harmless: both renders are identical.
+        rendered = RenderedResponse(ROUTES[route](statistics, query))
+        with self._lock:
+            self._entries[key] = rendered
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+    def warm(self, statistics: StatisticsSnapshot) -> None:
+        """Render every route of ``statistics`` (unfiltered) ahead of the first request."""
+        for route in ROUTES:
+            self.get(statistics, route)
+
+response_cache = ResponseCache()
+# Newly loaded statistics are rendered by the reload thread, not by the first request that sees them.
+registry.on_swap(response_cache.warm)
+
+def respond(request: Request, statistics: StatisticsSnapshot, route: str, query: StatisticsQuery = StatisticsQuery()) -> Response:
+    return response_cache.get(statistics, route, query).respond(request)
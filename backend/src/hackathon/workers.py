@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .algorithm import compute_pension_funds_batch
+from .cache import pension_cache
+from .mapper import StatisticsSnapshot, current
+from .models import Calculation
+
+POOL_WORKERS = int(os.getenv("PENSION_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Calculations queued or running at once; beyond this requests are turned away instead of piling up.
+POOL_MAX_PENDING = int(os.getenv("PENSION_POOL_MAX_PENDING", str(POOL_WORKERS * 8)))
+POOL_TIMEOUT_SECONDS = float(os.getenv("PENSION_POOL_TIMEOUT_SECONDS", "2.0"))
+# Forking the server would copy its threads and locks (registry poller, write buffer) into workers.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class PensionPoolBusy(RuntimeError):
+    pass
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(POOL_MAX_PENDING)
+
+def _compute(calc: Calculation, statistics: StatisticsSnapshot) -> dict:
+    # Workers get the request's snapshot with the task instead of reading their own copy of the file.
+    return compute_pension_funds_batch([calc], statistics)[0]
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context(POOL_START_METHOD),
+            )
+        return _pool
+
+def start_pool() -> None:
+    """Create the pool at startup so the first request does not pay for booting the forkserver.
+
+    The executor only launches processes on submit, so a no-op task is sent
+    to get them going without waiting for it.
+    """
+    get_pool().submit(int)
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def compute_pension(calc: Calculation, timeout: float = POOL_TIMEOUT_SECONDS, statistics: StatisticsSnapshot | None = None) -> dict:
+    """Pension result for ``calc``, from the cache or computed on the process pool.
+
+    Raises ``PensionPoolBusy`` when ``POOL_MAX_PENDING`` calculations are
+    already in flight and ``TimeoutError`` when the result takes longer than
+    ``timeout`` seconds.
+    """
+    return pension_cache.get_or_compute(calc, _compute_on_pool(timeout), statistics or current())
+
+def _compute_on_pool(timeout: float):
+    def compute(calc: Calculation, statistics: StatisticsSnapshot) -> dict:
+        if not _pending.acquire(blocking=False):
+            raise PensionPoolBusy("pension calculation pool is saturated")
+        future = get_pool().submit(_compute, calc, statistics)
+        future.add_done_callback(lambda _: _pending.release())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"pension calculation exceeded {timeout}s")
+    return compute
+
+def submit_pension_batch(calcs: list[Calculation], statistics: StatisticsSnapshot | None = None) -> Future:
+    """Evaluate ``calcs`` as one vectorized batch on the pool; the future holds one result per calculation.
+
+    A batch takes a single pending slot and skips the per-calculation
+    cache, since ingested calculations are rarely asked for again. Raises
+    ``PensionPoolBusy`` when the pool is saturated.
+    """
+    if not _pending.acquire(blocking=False):
+        raise PensionPoolBusy("pension calculation pool is saturated")
+    future = get_pool().submit(compute_pension_funds_batch, calcs, statistics or current())
+    future.add_done_callback(lambda _: _pending.release())
+    return future
@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+from .converters import DbRows
+from .database import AsyncSessionLocal, store_calculations
+
+# Opt-in: submissions are inserted in groups, one transaction (and one fsync) per group.
+WRITE_BUFFER_ENABLED = os.getenv("CALCULATION_WRITE_BUFFER", "").lower() in ("1", "true", "yes", "on")
+WRITE_BUFFER_MAX_ROWS = int(os.getenv("CALCULATION_WRITE_BUFFER_MAX_ROWS", "200"))
+WRITE_BUFFER_MAX_DELAY_MS = float(os.getenv("CALCULATION_WRITE_BUFFER_MAX_DELAY_MS", "10"))
+# "commit": a submission returns once its group is committed; "enqueue": as soon as it is
+# queued, so a crash may lose the last WRITE_BUFFER_MAX_DELAY_MS of submissions.
+WRITE_BUFFER_ACK = os.getenv("CALCULATION_WRITE_ACK", "commit")
+
+class WriteBuffer:
+    """Collects calculations from concurrent requests and inserts them together.
+
+    A group is flushed when it reaches ``max_rows`` or ``max_delay``
+    seconds after its first row, whichever comes first. Flushes run one at
+    a time, so SQLite sees a single writer. Must be used from one event
+    loop.
+    """
+
+    def __init__(self, max_rows: int = WRITE_BUFFER_MAX_ROWS, max_delay: float = WRITE_BUFFER_MAX_DELAY_MS / 1000, wait_for_commit: bool = WRITE_BUFFER_ACK != "enqueue"):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.wait_for_commit = wait_for_commit
+        self._pending: list[DbRows] = []
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def add(self, row: DbRows) -> None:
+        """Queue ``row``; with ``wait_for_commit``, return once it is committed (or raise why it was not)."""
+        loop = asyncio.get_running_loop()
+        self._pending.append(row)
+        committed = None
+        if self.wait_for_commit:
+            committed = loop.create_future()
+            self._waiters.append(committed)
+        if len(self._pending) >= self.max_rows:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush_pending)
+        if committed is not None:
+            # A client that goes away must not cancel the outcome the rest of its group waits on.
+            await asyncio.shield(committed)
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        rows, waiters = self._pending, self._waiters
+        self._pending, self._waiters = [], []
+        task = asyncio.get_running_loop().create_task(self._flush(rows, waiters))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, rows: list[DbRows], waiters: list[asyncio.Future]) -> None:
+        async with self._lock:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await store_calculations(db, rows)
+                    await db.commit()
+            except Exception as e:
+                if not waiters:
+                    print(f"Warning: Lost {len(rows)} buffered calculations: {str(e)}")
+                for committed in waiters:
+                    if not committed.done():
+                        committed.set_exception(e)
+                return
+        for committed in waiters:
+            if not committed.done():
+                committed.set_result(None)
+
+    async def close(self) -> None:
+        """Flush whatever is queued and wait for every flush in progress."""
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+_buffer: WriteBuffer | None = None
+
+def get_write_buffer() -> WriteBuffer | None:
+    """The running write buffer, or None when submissions are written directly."""
+    return _buffer
+
+def start_write_buffer() -> None:
+    global _buffer
+    if WRITE_BUFFER_ENABLED and _buffer is None:
+        _buffer = WriteBuffer()
+
+async def stop_write_buffer() -> None:
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        await buffer.close()
@@ -0,0 +1,124 @@
+"""Single-sheet XLSX written row by row straight into the response body.
+
+An XLSX file is a zip of XML parts. ``zipfile`` can write to a stream it
+cannot seek (sizes go into data descriptors after each part), so the
+sheet XML is compressed as rows arrive and every finished chunk is handed
+to the caller; nothing but the current chunk of rows is kept in memory.
+"""
+import math
+import re
+import zipfile
+from typing import Any, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+# Style 1 is the bold header row, as pandas' to_excel wrote it.
+_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+_SHEET_START = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>"""
+_SHEET_END = "</sheetData></worksheet>"
+
+# Control characters XML 1.0 cannot carry.
+_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+class _Chunks:
+    """Write-only sink ``zipfile`` fills; it has no ``tell``, so zipfile streams instead of seeking back."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _column(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _cell(reference: str, value: Any, style: int = 0) -> str:
+    styled = f' s="{style}"' if style else ""
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return f'<c r="{reference}"{styled}><v>{value!r}</v></c>'
+    text = escape(_ILLEGAL.sub("", str(value)))
+    return f'<c r="{reference}"{styled} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _row(number: int, values: Sequence[Any], columns: list[str], style: int = 0) -> str:
+    cells = "".join(_cell(f"{column}{number}", value, style) for column, value in zip(columns, values))
+    return f'<row r="{number}">{cells}</row>'
+
+def stream_xlsx(sheet_name: str, header: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Yield an XLSX workbook with one sheet: ``header`` in bold, then ``rows``.
+
+    Compressed bytes are yielded after every ``chunk_rows`` rows, so the
+    client receives the file while ``rows`` is still being read.
+    """
+    sink = _Chunks()
+    columns = [_column(index) for index in range(len(header))]
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        # Excel limits sheet names to 31 characters.
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=quoteattr(sheet_name[:31])))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/styles.xml", _STYLES)
+        # The sheet's size is unknown up front; without zip64 a sheet past 2 GiB fails when it is closed.
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_START + _row(1, header, columns, style=1)).encode())
+            pending = []
+            for number, values in enumerate(rows, start=2):
+                pending.append(_row(number, values, columns))
+                if len(pending) >= chunk_rows:
+                    sheet.write("".join(pending).encode())
+                    pending.clear()
+                    yield sink.drain()
+            sheet.write(("".join(pending) + _SHEET_END).encode())
+    yield sink.drain()
@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from hackathon.database import get_async_db, get_async_read_db
+from hackathon.main import app
+from hackathon.models import Base, Calculation, Job, Sex
+
+
+@pytest.fixture
+def make_calculation():
+    """Factory for engine ``Calculation``s: a man aged 30 in 2026, one open-ended job from 2000.
+
+    Keyword arguments override any field.
+    """
+    def make(**fields) -> Calculation:
+        jobs = fields.pop("jobs", [Job(start_date=2000, base_salary=6000.0)])
+        return Calculation(**{
+            "calculation_id": uuid.uuid4(),
+            "calculation_datetime": datetime(2026, 1, 1),
+            "expected_pension": 0.0,
+            "age": 30,
+            "sex": Sex.MALE,
+            "year_work_start": jobs[0].start_date,
+            "year_desired_retirement": 2060,
+            "jobs": jobs,
+            "leaves": [],
+            "include_expected_absence": False,
+            **fields,
+        })
+    return make
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sessions on an empty SQLite database, also used by the app's session dependencies."""
+    path = tmp_path / "hackathon.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    # No pooling: each TestClient request runs on its own event loop.
+    sessions = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool),
+        class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    )
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_db
+    app.dependency_overrides[get_async_read_db] = get_db
+    yield sessions
+    app.dependency_overrides.pop(get_async_db)
+    app.dependency_overrides.pop(get_async_read_db)
@@ -0,0 +1,40 @@
+import pytest
+
+from hackathon.algorithm import RetirementCheckpoints, compute_pension_funds_batch, horizon_year
+from hackathon.models import Job
+
+
+@pytest.mark.parametrize("jobs", [
+    [Job(start_date=2000, end_date=2045, base_salary=6000.0)],
+    [Job(start_date=2000, end_date=2020, base_salary=5000.0), Job(start_date=2022, end_date=2040, base_salary=9000.0)],
+])
+def test_checkpoints_match_engine_after_last_job_end(make_calculation, jobs):
+    calc = make_calculation(jobs=jobs)
+    years = list(range(2040, 2061))
+    checkpoints = RetirementCheckpoints(calc).pensions(years)
+    engine = compute_pension_funds_batch([calc.model_copy(update={"year_desired_retirement": year}) for year in years])
+    for year, result in zip(years, engine):
+        expected = result["monthly_pension"]
+        assert expected is not None
+        assert checkpoints[year] == pytest.approx(expected), year
+
+
+def test_checkpoints_match_engine_across_horizon(make_calculation):
+    calc = make_calculation(age=20, jobs=[Job(start_date=2010, end_date=2050, base_salary=6000.0)])
+    horizon = horizon_year()
+    years = list(range(horizon - 3, horizon + 5))
+    checkpoints = RetirementCheckpoints(calc).pensions(years)
+    engine = compute_pension_funds_batch([calc.model_copy(update={"year_desired_retirement": year}) for year in years])
+    for year, result in zip(years, engine):
+        expected = result["monthly_pension"]
+        assert expected is not None
+        assert checkpoints[year] == pytest.approx(expected), year
+
+
+def test_checkpoints_past_horizon_with_open_ended_job(make_calculation):
+    calc = make_calculation(age=20)
+    horizon = horizon_year()
+
+    assert RetirementCheckpoints(calc).pension_at(horizon) is not None
+    with pytest.raises(ValueError, match="horizon"):
+        RetirementCheckpoints(calc).pension_at(horizon + 1)
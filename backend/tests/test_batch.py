@@ -0,0 +1,141 @@
+import asyncio
+import json
+from concurrent.futures import Future
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from hackathon import batch, main
+from hackathon.algorithm import compute_pension_funds_batch
+from hackathon.batch import BatchTooLarge, parse_requests
+from hackathon.main import app
+from hackathon.models import DbCalculation
+
+REQUEST = {
+    "calculationDate": "2026-01-01",
+    "calculationTime": "10:00:00",
+    "expectedPension": "3000",
+    "age": 30,
+    "sex": "M",
+    "salary": "6000",
+    "isSickLeaveIncluded": False,
+    "totalAccumulatedFunds": "",
+    "yearWorkStart": 2000,
+    "yearDesiredRetirement": 2060,
+    "jobs": [{"startDate": "01-01-2000", "endDate": "31-12-2045", "baseSalary": 6000}],
+    "leaves": [],
+}
+
+
+def _requests(count: int) -> list[dict]:
+    return [{**REQUEST, "age": 30 + index} for index in range(count)]
+
+
+def _ndjson(records: list) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def _stored(sessions) -> int:
+    async def count():
+        async with sessions() as db:
+            return await db.scalar(select(func.count()).select_from(DbCalculation))
+    return asyncio.run(count())
+
+
+def test_json_array_and_ndjson_parse_alike():
+    records = _requests(3)
+
+    from_json = parse_requests(json.dumps(records).encode())
+    from_ndjson = parse_requests(_ndjson(records).replace(b"\n", b"\n\n"), ndjson=True)
+
+    assert [request.age for request in from_json] == [30, 31, 32]
+    assert from_ndjson == from_json
+    assert parse_requests(b" [ ] ") == []
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_errors_are_located_by_record(ndjson):
+    records = _requests(3)
+    records[1] = {**records[1], "age": "thirty"}
+    records[2] = {**records[2], "jobs": [{"startDate": "2000-01-01", "baseSalary": 6000}]}
+    body = _ndjson(records) if ndjson else json.dumps(records).encode()
+
+    with pytest.raises(RequestValidationError) as raised:
+        parse_requests(body, ndjson=ndjson)
+
+    assert [error["loc"] for error in raised.value.errors()] == [
+        ("body", 1, "age"),
+        ("body", 2, "jobs", 0, "startDate"),
+    ]
+
+
+@pytest.mark.parametrize("body", [b"[{}", b'[{"age": 30} {}]', b"[] []", b"{}"])
+def test_malformed_json_is_rejected(body):
+    with pytest.raises(RequestValidationError) as raised:
+        parse_requests(body)
+
+    assert raised.value.errors()[0]["type"] in {"json_invalid", "list_type"}
+
+
+@pytest.mark.parametrize("ndjson", [False, True])
+def test_limit_stops_parsing_early(monkeypatch, ndjson):
+    monkeypatch.setattr(batch, "BATCH_MAX_ROWS", 2)
+    records = _ndjson(_requests(3)) + b"\nnot json" if ndjson else json.dumps(_requests(3)).encode()[:-1] + b", not json]"
+
+    with pytest.raises(BatchTooLarge):
+        parse_requests(records, ndjson=ndjson)
+
+
+def test_batch_over_limit_gets_413(monkeypatch, database):
+    monkeypatch.setattr(batch, "BATCH_MAX_ROWS", 2)
+
+    response = TestClient(app).post("/calculations/batch", json=_requests(3))
+
+    assert response.status_code == 413
+    assert _stored(database) == 0
+
+
+def test_batch_is_priced_chunk_by_chunk(monkeypatch, database):
+    chunks = []
+
+    def submit(calcs, statistics):
+        chunks.append(len(calcs))
+        future = Future()
+        future.set_result(compute_pension_funds_batch(calcs, statistics))
+        return future
+
+    monkeypatch.setattr(main, "submit_pension_batch", submit)
+
+    response = TestClient(app).post(
+        "/calculations/batch?chunkSize=2",
+        content=_ndjson(_requests(5)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["inserted"] == 5
+    assert chunks == [2, 2, 1]
+    assert all(result["nominalPension"] for result in body["results"])
+    assert _stored(database) == 5
+
+
+def test_failed_batch_stores_nothing(monkeypatch, database):
+    store_calculations = main.store_calculations
+    calls = []
+
+    async def fail_on_second_chunk(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        await store_calculations(db, rows)
+
+    monkeypatch.setattr(main, "store_calculations", fail_on_second_chunk)
+
+    with pytest.raises(RuntimeError):
+        TestClient(app).post("/calculations/batch?chunkSize=2", json=_requests(3))
+
+    assert calls == [2, 1]
+    assert _stored(database) == 0
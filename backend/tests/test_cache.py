@@ -0,0 +1,115 @@
+import json
+import shutil
+import time
+
+from hackathon import cache, statistics_pack
+from hackathon.cache import PensionCache, calculation_key
+from hackathon.mapper import FILE, StatisticsRegistry, StatisticsSnapshot, current
+from hackathon.models import Job, Leave, LeaveType
+
+RESULT = {"funds_by_year": {2030: (1.0, 1.0)}, "monthly_pension": {"nominal": 1.0, "real": 1.0}}
+
+
+class _UnavailableBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+    def set(self, key, value, ttl_seconds):
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+
+def test_entries_expire_after_ttl():
+    pensions = PensionCache(ttl_seconds=0.01)
+    pensions.put("key", RESULT)
+    assert pensions.get("key") is RESULT
+
+    time.sleep(0.02)
+
+    assert pensions.get("key") is None
+    assert pensions.stats()["evictions"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    pensions = PensionCache(max_entries=2)
+    pensions.put("a", RESULT)
+    pensions.put("b", RESULT)
+    pensions.get("a")
+    pensions.put("c", RESULT)
+
+    assert pensions.get("b") is None
+    assert pensions.get("a") is RESULT
+    assert pensions.get("c") is RESULT
+
+
+def test_key_ignores_job_and_leave_order(make_calculation):
+    jobs = [Job(start_date=2000, end_date=2010, base_salary=5000.0), Job(start_date=2011, base_salary=7000.0)]
+    leaves = [
+        Leave(duration_days=10, leave_year=2005, leave_type=LeaveType.SICKNESS),
+        Leave(duration_days=20, leave_year=2012, leave_type=LeaveType.MATERNITY),
+        Leave(duration_days=5, leave_year=2005, leave_type=LeaveType.SICKNESS),
+    ]
+    calc = make_calculation(jobs=jobs, leaves=leaves)
+    reordered = make_calculation(jobs=jobs[::-1], leaves=leaves[::-1])
+
+    assert calculation_key(calc, "v") == calculation_key(reordered, "v")
+    assert calculation_key(calc, "v") != calculation_key(calc, "w")
+
+
+def test_new_statistics_version_misses(make_calculation):
+    raw = json.loads(FILE.read_bytes())
+    raw["valorization"] = {year: rate + 0.01 for year, rate in raw["valorization"].items()}
+    other = StatisticsSnapshot(raw, "test-other")
+    calc = make_calculation()
+    pensions = PensionCache()
+
+    first = pensions.get_or_compute(calc, statistics=current())
+    second = pensions.get_or_compute(calc, statistics=other)
+
+    assert pensions.stats()["misses"] == 2
+    assert second["monthly_pension"]["nominal"] > first["monthly_pension"]["nominal"]
+
+
+def test_statistics_swap_clears_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(statistics_pack, "SHARED_DIR", "")
+    path = tmp_path / "statistics.json"
+    shutil.copy(FILE, path)
+    registry = StatisticsRegistry(path, manifest=None)
+    pensions = PensionCache()
+    registry.on_swap(lambda _: pensions.clear())
+    pensions.put("key", RESULT)
+
+    raw = json.loads(path.read_bytes())
+    raw["valorization"] = {year: rate + 0.01 for year, rate in raw["valorization"].items()}
+    path.write_text(json.dumps(raw))
+
+    assert registry.reload()
+    assert pensions.get("key") is None
+
+
+def test_unavailable_backend_falls_back_to_local_cache(make_calculation):
+    backend = _UnavailableBackend()
+    pensions = PensionCache(backend=backend)
+    calc = make_calculation()
+
+    first = pensions.get_or_compute(calc)
+    second = pensions.get_or_compute(calc)
+
+    assert first["monthly_pension"] is not None
+    assert second is first
+    assert pensions.stats()["hits"] == 1
+    # The failed lookup puts the backend on hold, so the write after it is skipped.
+    assert backend.calls == 1
+    assert pensions.backend_errors == 1
+
+
+def test_unreachable_redis_url_still_computes(make_calculation):
+    backend = cache.shared_backend("redis://127.0.0.1:1/0")
+
+    result = PensionCache(backend=backend).get_or_compute(make_calculation())
+
+    assert result["monthly_pension"] is not None
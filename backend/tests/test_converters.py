@@ -0,0 +1,34 @@
+import pytest
+
+from hackathon.converters import to_calculation, to_db_rows
+from hackathon.schemas import CalculationRequest
+
+
+def _request(**fields) -> CalculationRequest:
+    body = {
+        "calculationDate": "2026-01-01",
+        "calculationTime": "10:00:00",
+        "expectedPension": "5000",
+        "age": 30,
+        "sex": "male",
+        "salary": "6000",
+        "isSickLeaveIncluded": True,
+        "totalAccumulatedFunds": "",
+        "yearWorkStart": 2015,
+        "yearDesiredRetirement": 2060,
+        "jobs": [{"startDate": "01-01-2015", "endDate": None, "baseSalary": 6000}],
+        "leaves": [],
+    }
+    return CalculationRequest(**{**body, **fields})
+
+
+@pytest.mark.parametrize("sex", ["male", "female", "M", "F", "m", "f", "other"])
+def test_stored_sex_matches_priced_sex(sex):
+    request = _request(sex=sex)
+    assert to_db_rows(request, "id").calculation["sex"] == to_calculation(request).sex.value
+
+
+@pytest.mark.parametrize("funds", ["", " ", "0", "0.00", "125000.50"])
+def test_stored_funds_match_priced_funds(funds):
+    request = _request(totalAccumulatedFunds=funds)
+    assert to_db_rows(request, "id").calculation["total_accumulated_funds"] == to_calculation(request).total_accumulated_funds
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from hackathon.algorithm import compute_pension_funds_batch
+from hackathon.mapper import current
+from hackathon.models import LEAVE_MULTIPLIERS, Job, Leave, LeaveType, Sex
+
+
+def _compound(rates, start_year: int, end_year: int) -> float:
+    """Product of ``1 + rate`` over ``[start_year, end_year)``, inverted when going back in time."""
+    factor = 1.0
+    for year in range(min(start_year, end_year), max(start_year, end_year)):
+        factor *= 1 + rates[year]
+    return factor if end_year >= start_year else 1 / factor
+
+
+def _reference_funds(calc, now: int) -> dict[int, tuple[float, float]]:
+    """The engine's rules, one year and one job at a time."""
+    statistics = current()
+    ends = [min(calc.year_desired_retirement if job.end_date is None else job.end_date, calc.year_desired_retirement) for job in calc.jobs]
+    threshold = 25 if calc.sex == Sex.MALE else 20
+    if sum(end - job.start_date + 1 for job, end in zip(calc.jobs, ends)) < threshold:
+        return {}
+    first_year = min(job.start_date for job in calc.jobs)
+    cutoff = now if calc.total_accumulated_funds is not None else -1
+    funds = calc.total_accumulated_funds or 0.0
+    result = {}
+    for year in range(first_year, max(ends)):
+        active = [(job, end) for job, end in zip(calc.jobs, ends) if max(job.start_date, cutoff) <= year < end]
+        if not active:
+            continue
+        total_days = 366 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 365
+        if calc.leaves:
+            leave_days = sum(leave.duration_days for leave in calc.leaves if leave.leave_year == year)
+            weighted_days = sum(leave.duration_days * LEAVE_MULTIPLIERS[leave.leave_type] for leave in calc.leaves if leave.leave_year == year)
+        elif calc.include_expected_absence:
+            absence = (statistics.expected_absence_female if calc.sex == Sex.FEMALE else statistics.expected_absence_male)[max(18, min(65, calc.age))]
+            leave_days, weighted_days = absence, absence * LEAVE_MULTIPLIERS[LeaveType.SICKNESS]
+        else:
+            leave_days = weighted_days = 0
+        rate = ((total_days - leave_days) * 0.196 + weighted_days) / total_days
+        salary = sum(job.base_salary * _compound(statistics.growth, job.start_date, year) for job, _ in active)
+        contribution = min(12 * salary * rate, 30 * statistics.average_wage[year])
+        funds = (funds + contribution) * (1 + statistics.valorization[year])
+        result[year] = (funds, funds / _compound(statistics.inflation, first_year, now))
+    return result
+
+
+def _random_career(rng: random.Random, make_calculation):
+    jobs = []
+    for _ in range(rng.randint(1, 4)):
+        # Independent spans, so jobs overlap; some open-ended, some paid above the contribution cap.
+        start = rng.randint(1996, 2035)
+        end = rng.choice([None, start + rng.randint(0, 30)])
+        jobs.append(Job(start_date=start, end_date=end, base_salary=rng.choice([rng.uniform(3000, 20000), rng.uniform(50_000, 300_000)])))
+    leaves = [
+        Leave(duration_days=rng.randint(1, 120), leave_year=rng.randint(1996, 2070), leave_type=rng.choice(list(LeaveType)))
+        for _ in range(rng.choice([0, 0, 3, 10]))
+    ]
+    return make_calculation(
+        age=rng.randint(20, 60),
+        sex=rng.choice(list(Sex)),
+        total_accumulated_funds=rng.choice([None, 50_000.0]),
+        year_desired_retirement=rng.randint(2030, 2079),
+        jobs=jobs,
+        leaves=leaves,
+        include_expected_absence=rng.random() < 0.7,
+    )
+
+
+def test_batch_engine_matches_reference_loop(make_calculation):
+    rng = random.Random(0)
+    now = datetime.now().year
+    calcs = [_random_career(rng, make_calculation) for _ in range(300)]
+    life_expectancy = current().life_expectancy
+
+    results = compute_pension_funds_batch(calcs)
+
+    capped = 0
+    for calc, result in zip(calcs, results):
+        expected = _reference_funds(calc, now)
+        assert result["funds_by_year"].keys() == expected.keys()
+        for year, (nominal, real) in expected.items():
+            assert result["funds_by_year"][year] == pytest.approx((nominal, real), rel=1e-9)
+        age = calc.age + calc.year_desired_retirement - calc.calculation_datetime.year
+        if not expected or age not in life_expectancy:
+            assert result["monthly_pension"] is None
+            continue
+        nominal, real = expected[max(expected)]
+        assert result["monthly_pension"] == pytest.approx({"nominal": nominal / life_expectancy[age], "real": real / life_expectancy[age]}, rel=1e-9)
+        capped += any(job.base_salary > 50_000 for job in calc.jobs)
+    assert capped > 0
@@ -0,0 +1,72 @@
+from datetime import datetime
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+BACKEND = Path(__file__).resolve().parents[1]
+# The last revision that kept jobs and leaves in JSON columns on calculations.
+JSON_REVISION = "3c9e1f7a2b4d"
+
+JOBS = [
+    {"startDate": "01-02-2000", "endDate": "31-12-2009", "baseSalary": 5000},
+    {"startDate": "01-01-2010", "endDate": None, "baseSalary": 7250.5},
+]
+LEAVES = [{"startDate": "15-03-2005", "endDate": "30-04-2005"}, {"startDate": "01-06-2012", "endDate": None}]
+
+
+def _config(url: str) -> Config:
+    config = Config(str(BACKEND / "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def _table(engine, name: str) -> sa.Table:
+    return sa.Table(name, sa.MetaData(), autoload_with=engine)
+
+
+def test_jobs_and_leaves_move_to_tables_and_back(tmp_path):
+    url = f"sqlite:///{tmp_path / 'hackathon.db'}"
+    config = _config(url)
+    command.upgrade(config, JSON_REVISION)
+    engine = sa.create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(sa.insert(_table(engine, "calculations")), [
+            {
+                "calculation_id": calculation_id, "calculation_datetime": datetime(2026, 1, 1, 10),
+                "expected_pension": 3000.0, "age": 40, "sex": "F",
+                "year_work_start": 2000, "year_desired_retirement": 2050,
+                "jobs": jobs, "leaves": leaves,
+            }
+            for calculation_id, jobs, leaves in [("a", JOBS, LEAVES), ("b", [], [])]
+        ])
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        jobs = connection.execute(sa.text(
+            "SELECT calculation_id, position, start_date, end_date, start_year, end_year, base_salary FROM calculation_jobs ORDER BY position"
+        )).all()
+        leaves = connection.execute(sa.text(
+            "SELECT calculation_id, position, start_date, end_date, start_year, end_year FROM calculation_leaves ORDER BY position"
+        )).all()
+    assert [tuple(job) for job in jobs] == [
+        ("a", 0, "2000-02-01", "2009-12-31", 2000, 2009, 5000.0),
+        ("a", 1, "2010-01-01", None, 2010, None, 7250.5),
+    ]
+    assert [tuple(leave) for leave in leaves] == [
+        ("a", 0, "2005-03-15", "2005-04-30", 2005, 2005),
+        ("a", 1, "2012-06-01", None, 2012, 2012),
+    ]
+    assert "jobs" not in {column.name for column in _table(engine, "calculations").columns}
+
+    command.downgrade(config, JSON_REVISION)
+
+    with engine.connect() as connection:
+        restored = {row.calculation_id: row for row in connection.execute(sa.select(_table(engine, "calculations")))}
+    assert restored["a"].jobs == JOBS
+    assert restored["a"].leaves == LEAVES
+    assert (restored["b"].jobs, restored["b"].leaves) == ([], [])
+    assert not sa.inspect(engine).has_table("calculation_jobs")
+    engine.dispose()
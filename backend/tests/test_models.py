@@ -0,0 +1,30 @@
+import pytest
+from pydantic import ValidationError
+
+from hackathon.algorithm import compute_pension_funds_batch
+from hackathon.cache import calculation_key
+from hackathon.models import Leave, LeaveType
+
+
+@pytest.fixture
+def calc(make_calculation):
+    return make_calculation(leaves=[Leave(duration_days=200, leave_year=2030, leave_type=LeaveType.SICKNESS)])
+
+
+def test_copy_with_new_leaves_rebuilds_leave_index(calc):
+    assert len(calc.leave_index) == 1
+    copy = calc.model_copy(update={"leaves": []})
+
+    assert len(copy.leave_index) == 0
+    assert len(calc.leave_index) == 1
+    original, without_leaves = compute_pension_funds_batch([calc, copy])
+    assert original["monthly_pension"] != without_leaves["monthly_pension"]
+    assert calculation_key(calc) != calculation_key(copy)
+
+
+def test_leaves_cannot_change_in_place(calc):
+    assert calc.leave_index.years.tolist() == [2030]
+    with pytest.raises((TypeError, AttributeError)):
+        calc.leaves.append(Leave(duration_days=10, leave_year=2031, leave_type=LeaveType.SICKNESS))
+    with pytest.raises(ValidationError):
+        calc.leaves[0].duration_days = 1
@@ -0,0 +1,93 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hackathon.main import app
+from hackathon.models import DbCalculation
+from hackathon.pagination import Cursor
+
+# Four calculations share a moment, so their order rests on the id alone.
+MOMENTS = [datetime(2026, 1, 1, 10), *[datetime(2026, 1, 2, 10)] * 4, datetime(2026, 1, 3, 10), datetime(2026, 1, 4, 10)]
+IDS = [f"id-{index}" for index in range(len(MOMENTS))]
+# Newest first, ties by descending id.
+LISTED = ["id-6", "id-5", "id-4", "id-3", "id-2", "id-1", "id-0"]
+
+
+@pytest.fixture
+def client(database):
+    async def seed():
+        async with database() as db:
+            db.add_all(
+                DbCalculation(
+                    calculation_id=calculation_id, calculation_datetime=moment, expected_pension=3000.0,
+                    age=30, sex="M", year_work_start=2000, year_desired_retirement=2060,
+                )
+                for calculation_id, moment in zip(IDS, MOMENTS)
+            )
+            await db.commit()
+    asyncio.run(seed())
+    return TestClient(app)
+
+
+def _ids(page: dict) -> list[str]:
+    return [submission["calculationId"] for submission in page["submissions"]]
+
+
+def test_next_and_prev_cursors_walk_the_same_pages(client):
+    pages = [client.get("/calculations", params={"limit": 3}).json()]
+    while pages[-1]["nextCursor"]:
+        pages.append(client.get("/calculations", params={"limit": 3, "cursor": pages[-1]["nextCursor"]}).json())
+
+    assert [_ids(page) for page in pages] == [LISTED[0:3], LISTED[3:6], LISTED[6:]]
+    assert pages[0]["prevCursor"] is None
+
+    back = client.get("/calculations", params={"limit": 3, "cursor": pages[2]["prevCursor"]}).json()
+    assert _ids(back) == LISTED[3:6]
+    first = client.get("/calculations", params={"limit": 3, "cursor": back["prevCursor"]}).json()
+    assert _ids(first) == LISTED[0:3]
+    assert first["prevCursor"] is None
+    assert first["nextCursor"] == pages[0]["nextCursor"]
+
+
+def test_rows_at_the_same_moment_split_across_pages_by_id(client):
+    first = client.get("/calculations", params={"limit": 2, "cursor": Cursor(MOMENTS[5], "id-5", "next").encode()}).json()
+    second = client.get("/calculations", params={"limit": 2, "cursor": first["nextCursor"]}).json()
+
+    assert _ids(first) == ["id-4", "id-3"]
+    assert _ids(second) == ["id-2", "id-1"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    base64.urlsafe_b64encode(json.dumps(["2026-01-02T10:00:00", "id-3", "sideways"]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["yesterday", "id-3", "next"]).encode()).decode(),
+    Cursor(MOMENTS[0], "id-0", "next").encode()[:-3],
+])
+def test_malformed_or_tampered_cursor_gets_422(client, cursor):
+    response = client.get("/calculations", params={"cursor": cursor})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "invalid cursor"
+
+
+@pytest.mark.parametrize("total, expected", [("none", None), ("approximate", 7), ("exact", 7)])
+def test_total_counts(client, total, expected):
+    page = client.get("/calculations", params={"limit": 3, "total": total}).json()
+
+    assert page["totalItems"] == expected
+    assert page["totalPages"] == (3 if expected else None)
+
+
+def test_deprecated_page_number_matches_cursor_pages(client):
+    second = client.get("/calculations", params={"limit": 3, "page": 2}).json()
+
+    assert second["page"] == 2
+    assert _ids(second) == LISTED[3:6]
+    assert second["totalItems"] == 7
+    assert _ids(client.get("/calculations", params={"limit": 3, "cursor": second["nextCursor"]}).json()) == LISTED[6:]
+    assert _ids(client.get("/calculations", params={"limit": 3, "cursor": second["prevCursor"]}).json()) == LISTED[0:3]
@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pytest
+
+from hackathon import scenarios
+from hackathon.algorithm import compute_pension_funds_batch
+from hackathon.converters import to_calculation
+from hackathon.main import _pension_response
+from hackathon.mapper import FILE, StatisticsSnapshot, current
+from hackathon.scenarios import simulate_monthly_pension
+from hackathon.schemas import CalculationRequest
+
+
+def test_simulation_uses_given_snapshot(make_calculation):
+    calc = make_calculation()
+    raw = json.loads(FILE.read_bytes())
+    raw["valorization"] = {year: rate + 0.01 for year, rate in raw["valorization"].items()}
+    richer = StatisticsSnapshot(raw, "test-richer")
+
+    baseline = simulate_monthly_pension(calc, paths=500, seed=1)
+    scenario = simulate_monthly_pension(calc, paths=500, seed=1, statistics=richer)
+
+    assert scenario["nominal"]["p50"] > baseline["nominal"]["p50"]
+
+
+def test_zero_volatility_reproduces_deterministic_pension(monkeypatch):
+    request = CalculationRequest(
+        calculationDate="2026-01-01",
+        calculationTime="10:00:00",
+        expectedPension="5000",
+        age=30,
+        sex="male",
+        salary="6000",
+        isSickLeaveIncluded=True,
+        totalAccumulatedFunds="",
+        yearWorkStart=2015,
+        yearDesiredRetirement=2060,
+        jobs=[{"startDate": "01-01-2015", "endDate": "31-12-2050", "baseSalary": 6000}],
+        leaves=[],
+    )
+    statistics = current()
+    calc = to_calculation(request, statistics=statistics)
+    nominal = compute_pension_funds_batch([calc], statistics)[0]["monthly_pension"]["nominal"]
+    expected = _pension_response("id", request, nominal, statistics)
+    monkeypatch.setattr(scenarios, "SHOCK_VOLATILITY", np.zeros(3))
+
+    bands = simulate_monthly_pension(calc, paths=50, seed=1, statistics=statistics)
+
+    for band in bands["nominal"].values():
+        assert band == pytest.approx(float(expected.nominalPension), abs=0.01)
+    for band in bands["real"].values():
+        assert band == pytest.approx(float(expected.realPension), abs=0.01)
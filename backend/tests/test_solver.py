@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from hackathon.algorithm import compute_pension_funds_batch
+from hackathon.main import app
+from hackathon.models import Job
+from hackathon.solver import solve_retirement_year
+
+
+def test_retirement_year_after_last_job_end(make_calculation):
+    calc = make_calculation(jobs=[Job(start_date=2000, end_date=2045, base_salary=6000.0)])
+    first_year = max(datetime.now().year, 2026)
+    years = list(range(first_year, 2061))
+    engine = compute_pension_funds_batch([calc.model_copy(update={"year_desired_retirement": year}) for year in years])
+    pensions = dict(zip(years, (result["monthly_pension"] for result in engine)))
+    target = pensions[2055]["nominal"]
+    expected = next(year for year, pension in pensions.items() if pension is not None and pension["nominal"] >= target)
+
+    assert expected > 2045
+    assert solve_retirement_year(calc, target) == expected
+
+
+def test_solve_rejects_job_before_statistics():
+    body = {
+        "calculationDate": "2026-01-01",
+        "calculationTime": "10:00:00",
+        "expectedPension": "3000",
+        "age": 30,
+        "sex": "M",
+        "salary": "6000",
+        "isSickLeaveIncluded": False,
+        "totalAccumulatedFunds": "",
+        "yearWorkStart": 1990,
+        "yearDesiredRetirement": 2060,
+        "jobs": [{"startDate": "01-01-1990", "endDate": "31-12-2045", "baseSalary": 6000}],
+        "leaves": [],
+    }
+    response = TestClient(app).post("/calculations/solve", json=body)
+
+    assert response.status_code == 422
+    assert "1990" in response.json()["detail"]
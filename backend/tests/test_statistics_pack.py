@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pytest
+
+from hackathon import statistics_pack
+from hackathon.mapper import FILE, ScenarioSource
+
+
+def _write(directory):
+    return statistics_pack.write_pack(directory, {"version": "v"}, {"growth": (1996, np.array([0.01, 0.02, 0.03]))})
+
+
+def test_round_trip(tmp_path):
+    path = _write(tmp_path)
+    statistics_pack.verify_pack(path)
+    header, columns = statistics_pack.read_pack(path)
+
+    assert statistics_pack.find_pack("v", tmp_path) == path
+    assert statistics_pack.find_pack("w", tmp_path) is None
+    assert header == {"version": "v"}
+    assert columns["growth"][0] == 1996
+    assert columns["growth"][1].tolist() == [0.01, 0.02, 0.03]
+
+
+def test_changed_body_fails_verification_only(tmp_path):
+    path = _write(tmp_path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    # Attaching reads the header alone; the body is hashed once, when the pack is published.
+    statistics_pack.read_pack(path)
+    with pytest.raises(ValueError, match="checksum"):
+        statistics_pack.verify_pack(path)
+
+
+def test_rejects_pack_under_another_name(tmp_path):
+    path = _write(tmp_path)
+    renamed = path.rename(tmp_path / statistics_pack.pack_name("v", "0" * 64))
+
+    with pytest.raises(ValueError, match="name"):
+        statistics_pack.read_pack(renamed)
+
+
+def test_rejects_truncated_pack(tmp_path):
+    path = _write(tmp_path)
+    path.write_bytes(path.read_bytes()[:-8])
+
+    with pytest.raises(ValueError, match="truncated"):
+        statistics_pack.read_pack(path)
+
+
+def test_shared_dir_is_private(tmp_path, monkeypatch):
+    directory = tmp_path / "shared"
+    monkeypatch.setattr(statistics_pack, "SHARED_DIR", str(directory))
+
+    assert statistics_pack.shared_dir() == directory
+    assert directory.stat().st_mode & 0o777 == 0o700
+
+
+def test_shared_dir_writable_by_others_is_not_used(tmp_path, monkeypatch):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    monkeypatch.setattr(statistics_pack, "SHARED_DIR", str(directory))
+
+    assert statistics_pack.shared_dir() is None
+
+
+def test_tampered_shared_pack_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(statistics_pack, "SHARED_DIR", str(tmp_path / "shared"))
+    monkeypatch.setattr(statistics_pack, "COMPILED_DIR", str(tmp_path / "compiled"))
+    source = ScenarioSource(FILE)
+    published = source.load("test")
+    data = bytearray(published.pack.read_bytes())
+    data[-1] ^= 0xFF
+    published.pack.write_bytes(bytes(data))
+
+    reloaded = source.load("test")
+
+    assert reloaded.pack == published.pack
+    statistics_pack.verify_pack(reloaded.pack)
+    parsed = source.parse("test")
+    index, expected = reloaded.inflation_index, parsed.inflation_index
+    assert index.window(index.first_year, index.last_year).tolist() == expected.window(expected.first_year, expected.last_year).tolist()
+    assert [series.values.tolist() for series in reloaded.series()] == [series.values.tolist() for series in parsed.series()]
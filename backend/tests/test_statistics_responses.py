@@ -0,0 +1,91 @@
+import gzip
+import json
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hackathon import statistics_pack
+from hackathon.main import app, get_statistics_snapshot
+from hackathon.mapper import FILE, StatisticsRegistry, current
+
+client = TestClient(app)
+
+
+def test_etag_revalidates_with_304():
+    first = client.get("/statistics/inflation", headers={"Accept-Encoding": "identity"})
+    again = client.get("/statistics/inflation", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert "Accept-Encoding" in first.headers["Vary"]
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_gzip_variant_has_its_own_etag():
+    plain = client.get("/statistics", headers={"Accept-Encoding": "identity"})
+    # httpx decodes the body on its own; the raw stream shows what was sent.
+    with client.stream("GET", "/statistics", headers={"Accept-Encoding": "gzip"}) as zipped:
+        raw = b"".join(zipped.iter_raw())
+
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(raw) == plain.content
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+    assert client.get("/statistics", headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]}).status_code == 200
+    assert client.get("/statistics", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]}).status_code == 304
+
+
+def test_statistics_swap_changes_etag(tmp_path, monkeypatch):
+    monkeypatch.setattr(statistics_pack, "SHARED_DIR", "")
+    path = tmp_path / "statistics.json"
+    shutil.copy(FILE, path)
+    registry = StatisticsRegistry(path, manifest=None)
+    app.dependency_overrides[get_statistics_snapshot] = registry.current
+    try:
+        before = client.get("/statistics/valorization")
+        raw = json.loads(path.read_bytes())
+        raw["valorization"] = {year: rate + 0.01 for year, rate in raw["valorization"].items()}
+        path.write_text(json.dumps(raw))
+        assert registry.reload()
+        after = client.get("/statistics/valorization", headers={"If-None-Match": before.headers["ETag"]})
+    finally:
+        app.dependency_overrides.pop(get_statistics_snapshot)
+
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.json()[0]["value"] == pytest.approx(before.json()[0]["value"] + 0.01)
+
+
+def test_window_and_step():
+    rows = client.get("/statistics/average-wage", params={"from": 2000, "to": 2010, "step": 5}).json()
+
+    assert [row["year"] for row in rows] == [2000, 2005, 2010]
+    assert rows[1]["value"] == pytest.approx(current().average_wage[2005])
+
+
+def test_columns_format_shares_one_grid():
+    body = client.get("/statistics", params={"from": 2020, "to": 2023, "series": "inflation,valorization", "format": "columns"}).json()
+
+    assert body["years"] == [2020, 2021, 2022, 2023]
+    assert set(body["values"]) == {"inflation", "valorization"}
+    assert body["values"]["inflation"] == pytest.approx([current().inflation[year] for year in range(2020, 2024)])
+
+
+def test_series_selection_leaves_other_series_out():
+    body = client.get("/statistics", params={"series": "growth_rate"}).json()
+
+    assert body["growth_rate"]
+    assert not set(body) & {"average_wage", "valorization", "inflation", "life_expectancy"}
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/statistics/inflation", {"series": "inflation"}),
+    ("/statistics/life-expectancy/male", {"series": "life_expectancy"}),
+    ("/statistics", {"series": "unknown"}),
+    ("/statistics", {"series": "life_expectancy", "format": "columns"}),
+    ("/statistics/inflation", {"from": 2030, "to": 2020}),
+])
+def test_invalid_queries_get_422(path, params):
+    assert client.get(path, params=params).status_code == 422
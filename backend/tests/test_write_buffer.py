@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from functools import partial
+
+import pytest
+from sqlalchemy import func, select
+
+from hackathon import write_buffer
+from hackathon.converters import to_db_rows
+from hackathon.models import DbCalculation, DbJob
+from hackathon.schemas import CalculationRequest
+from hackathon.write_buffer import WriteBuffer
+
+REQUEST = CalculationRequest(
+    calculationDate="2026-01-01",
+    calculationTime="10:00:00",
+    expectedPension="3000",
+    age=30,
+    sex="M",
+    salary="6000",
+    isSickLeaveIncluded=False,
+    totalAccumulatedFunds="",
+    yearWorkStart=2000,
+    yearDesiredRetirement=2060,
+    jobs=[{"startDate": "01-01-2000", "baseSalary": 6000}],
+    leaves=[],
+)
+
+
+def _row(index: int):
+    return to_db_rows(REQUEST, f"id-{index}", datetime(2026, 1, 1, 10, 0, index))
+
+
+@pytest.fixture
+def flushes(monkeypatch, database):
+    """Sizes of the groups the buffer stored, in order, on the test database."""
+    sizes = []
+    store_calculations = write_buffer.store_calculations
+
+    async def store(db, rows):
+        sizes.append(len(rows))
+        await store_calculations(db, rows)
+
+    monkeypatch.setattr(write_buffer, "AsyncSessionLocal", database)
+    monkeypatch.setattr(write_buffer, "store_calculations", store)
+    return sizes
+
+
+async def _stored(database, model=DbCalculation) -> int:
+    async with database() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+def test_full_group_is_flushed_without_waiting_for_the_delay(flushes, database):
+    async def run():
+        buffer = WriteBuffer(max_rows=3, max_delay=60)
+        await asyncio.wait_for(asyncio.gather(*(buffer.add(_row(index)) for index in range(3))), timeout=5)
+        return await _stored(database), await _stored(database, DbJob)
+
+    assert asyncio.run(run()) == (3, 3)
+    assert flushes == [3]
+
+
+def test_partial_group_is_flushed_after_the_delay(flushes, database):
+    async def run():
+        buffer = WriteBuffer(max_rows=100, max_delay=0.05)
+        adds = asyncio.gather(*(buffer.add(_row(index)) for index in range(2)))
+        await asyncio.sleep(0.01)
+        assert flushes == []
+        await asyncio.wait_for(adds, timeout=5)
+        return await _stored(database)
+
+    assert asyncio.run(run()) == 2
+    assert flushes == [2]
+
+
+def test_failed_flush_reaches_every_waiter(monkeypatch, database):
+    async def fail(db, rows):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(write_buffer, "AsyncSessionLocal", database)
+    monkeypatch.setattr(write_buffer, "store_calculations", fail)
+
+    async def run():
+        buffer = WriteBuffer(max_rows=3, max_delay=60)
+        return await asyncio.gather(*(buffer.add(_row(index)) for index in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+
+
+def test_enqueue_mode_returns_before_the_flush(flushes, database):
+    async def run():
+        buffer = WriteBuffer(max_rows=100, max_delay=60, wait_for_commit=False)
+        for index in range(2):
+            await asyncio.wait_for(buffer.add(_row(index)), timeout=1)
+        before = await _stored(database)
+        await buffer.close()
+        return before, await _stored(database)
+
+    assert asyncio.run(run()) == (0, 2)
+    assert flushes == [2]
+
+
+def test_shutdown_drains_pending_rows(monkeypatch, flushes, database):
+    monkeypatch.setattr(write_buffer, "WRITE_BUFFER_ENABLED", True)
+    monkeypatch.setattr(write_buffer, "WriteBuffer", partial(WriteBuffer, max_delay=60, wait_for_commit=False))
+
+    async def run():
+        write_buffer.start_write_buffer()
+        buffer = write_buffer.get_write_buffer()
+        for index in range(3):
+            await buffer.add(_row(index))
+        await write_buffer.stop_write_buffer()
+        return await _stored(database)
+
+    assert asyncio.run(run()) == 3
+    assert flushes == [3]
+    assert write_buffer.get_write_buffer() is None
@@ -0,0 +1,35 @@
+import io
+
+from openpyxl import load_workbook
+
+from hackathon.xlsx_stream import stream_xlsx
+
+HEADER = ["ID", "Wiek", "Emerytura", "Kod pocztowy", "Uwagi"]
+
+
+def _rows(count: int):
+    for index in range(count):
+        yield [f"id-{index}", 30 + index % 40, 1234.5 + index, None if index % 3 else "00-950", "tab\tand <xml> & \x01control"]
+
+
+def test_multi_chunk_export_opens_in_openpyxl():
+    chunks = list(stream_xlsx("Obliczenia Emerytur", HEADER, _rows(95), chunk_rows=10))
+    assert len(chunks) > 9
+
+    sheet = load_workbook(io.BytesIO(b"".join(chunks)), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+
+    assert sheet.title == "Obliczenia Emerytur"
+    assert rows[0] == tuple(HEADER)
+    assert len(rows) == 96
+    assert rows[1] == ("id-0", 30, 1234.5, "00-950", "tab\tand <xml> & control")
+    assert rows[2][3] is None
+    assert all(isinstance(row[1], int) and isinstance(row[2], float) for row in rows[1:])
+    assert rows[-1][:3] == ("id-94", 30 + 94 % 40, 1234.5 + 94)
+
+
+def test_header_row_is_bold():
+    workbook = load_workbook(io.BytesIO(b"".join(stream_xlsx("Sheet", HEADER, _rows(1)))))
+
+    assert all(cell.font.b for cell in workbook.active[1])
+    assert not workbook.active["A2"].font.b